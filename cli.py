@@ -6,28 +6,233 @@ Ultra-durable 5D optical data storage command-line interface
 
 import os
 import sys
+import io
 import json
+import mmap
+import struct
 import argparse
 import hashlib
 import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple, Union
 from datetime import datetime
 
+import numpy as np
+
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 try:
     from crystal_archive.archive.manifest import Manifest
     from crystal_archive.archive.pipeline import encode_folder
-    from crystal_archive.codecs.compression import compress_data
-    from crystal_archive.codecs.ecc_ldpc import LDPCEncoder
-    from crystal_archive.codecs.ecc_rs import ReedSolomonEncoder
-    from crystal_archive.mapping.voxel_map import VoxelMapper, VoxelMode
+    from crystal_archive.codecs.compression import compress_data, decompress_data
+    from crystal_archive.codecs.ecc_rs import ReedSolomonCodec
+    from crystal_archive.mapping.voxel_map import VoxelMapper
 except ImportError:
     print("Error: CODEX Crystal Archive modules not found. Please install the package.")
     sys.exit(1)
 
+# orjson is much faster on large archives; fall back to stdlib json if absent
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_FILE_TYPES = {
+    '.txt': 'text/plain',
+    '.md': 'text/markdown',
+    '.json': 'application/json',
+    '.csv': 'text/csv',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.pdf': 'application/pdf',
+    '.doc': 'application/msword',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.zip': 'application/zip',
+}
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# Archive container: magic, raw payloads, manifest JSON, manifest length
+_ARCHIVE_MAGIC = b"CRYSARC\x00"
+_MANIFEST_LEN = struct.Struct(">Q")
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+def _json_load(f) -> Any:
+    """Parse JSON from a binary file object"""
+    if orjson is not None:
+        return orjson.loads(f.read())
+    return json.load(f)
+
+def _read_archive_manifest(f) -> Dict[str, Any]:
+    """Read the manifest from the end of an open archive file"""
+    if f.read(len(_ARCHIVE_MAGIC)) != _ARCHIVE_MAGIC:
+        raise ValueError("Not a crystal archive")
+    f.seek(-_MANIFEST_LEN.size, os.SEEK_END)
+    (manifest_len,) = _MANIFEST_LEN.unpack(f.read(_MANIFEST_LEN.size))
+    f.seek(-_MANIFEST_LEN.size - manifest_len, os.SEEK_END)
+    return _json_load(io.BytesIO(f.read(manifest_len)))
+
+def _load_archive(archive_path: Path) -> Tuple[Dict[str, Any], List[memoryview]]:
+    """Load an archive's manifest and zero-copy views of its payloads"""
+    with open(archive_path, 'rb') as f:
+        manifest = _read_archive_manifest(f)
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    view = memoryview(mm)
+    payloads = [view[offset:offset + length] for offset, length in manifest['payloads']]
+    return manifest, payloads
+
+def _walk_files(path: Path) -> Iterator[Path]:
+    """Recursively yield files under path using cached dirent types"""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_files(Path(entry.path))
+            elif entry.is_file():
+                yield Path(entry.path)
+
+@lru_cache(maxsize=None)
+def _get_codecs(mode: str) -> Tuple[VoxelMapper, ReedSolomonCodec]:
+    """Build the voxel mapper for a mode and the RS codec once per process"""
+    return VoxelMapper(mode=mode), ReedSolomonCodec()
+
+def _voxel_mode(profile: str) -> str:
+    """Get the voxel mode for an encoding profile"""
+    return "3bit" if profile == "A" else "5bit"
+
+def _encode_payload(data: bytes, mode: str, error_correction: bool) -> bytes:
+    """Add RS parity if enabled and map the bytes to voxel symbols, one per byte"""
+    voxel_mapper, rs_codec = _get_codecs(mode)
+    if error_correction:
+        data = rs_codec.encode(data)
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+    return voxel_mapper.bits_to_symbols(bits).tobytes()
+
+def _decode_payload(payload: bytes, file_info: Dict[str, Any], mode: str, codec: str,
+                    error_correction: bool) -> bytes:
+    """Reverse _encode_payload and decompression, giving the original file content"""
+    voxel_mapper, rs_codec = _get_codecs(mode)
+    size = file_info['compressed_size']
+    
+    # Symbols carry whole groups of bits, so drop the padding of the last one
+    n_bytes = -(-size // rs_codec.k) * rs_codec.n if error_correction else size
+    bits = voxel_mapper.symbols_to_bits(np.frombuffer(payload, dtype=np.uint8))
+    data = np.packbits(bits[:n_bytes * 8]).tobytes()
+    
+    if error_correction:
+        data = rs_codec.decode(data)
+        if data is None:
+            raise ValueError("Reed-Solomon decoding failed - too many errors")
+        data = data[:size]
+    
+    return decompress_data(data, {'codec': codec, 'original_size': file_info['original_size']})
+
+def _read_file(file_path: Path, chunk_size: int = 1 << 20,
+               mmap_threshold: int = 1 << 20) -> Union[bytearray, mmap.mmap]:
+    """
+    Read a file's content with as few copies as possible.
+    
+    Files larger than mmap_threshold are memory-mapped instead of copied into
+    the Python heap. Smaller files are read into one preallocated buffer.
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > mmap_threshold:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        content = bytearray(size)
+        view = memoryview(content)
+        pos = 0
+        while pos < len(content):
+            n = f.readinto(view[pos:pos + chunk_size])
+            if not n:
+                break
+            pos += n
+    
+    if pos < len(content):
+        # File shrank while reading
+        content = content[:pos]
+    return content
+
+def _bounded_map(ex: Executor, fn: Callable, *iterables: Iterable,
+                 window: int) -> Iterator[Any]:
+    """Like ex.map, but with at most window tasks in flight or awaiting collection"""
+    pending = deque()
+    for args in zip(*iterables):
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(ex.submit(fn, *args))
+    while pending:
+        yield pending.popleft().result()
+
+def _hash_file(file_path: Path, chunk_size: int = 1 << 20) -> str:
+    """Compute a file's SHA-256 without keeping its content"""
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(partial(f.read, chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def _encode_one(file_path: Path, checksum: str, mode: str, compression: bool,
+                error_correction: bool, input_parent: Path) -> Tuple[Dict[str, Any], bytes]:
+    """Run the encode pipeline for a single file (executed in a worker process)"""
+    # The parent already hashed the file to deduplicate it, so only read it
+    content = _read_file(file_path)
+    original_size = len(content)
+    
+    # Compress if enabled
+    if compression:
+        compressed_content, _ = compress_data(content)
+    else:
+        compressed_content = content
+    compressed_size = len(compressed_content)
+    
+    # Error correction and 5D optical encoding
+    final_encoded = _encode_payload(compressed_content, mode, error_correction)
+    
+    file_info = {
+        'name': str(file_path.relative_to(input_parent)),
+        'original_size': original_size,
+        'compressed_size': compressed_size,
+        'encoded_size': len(final_encoded),
+        'checksum': checksum
+    }
+    return file_info, final_encoded
+
+def _verify_one(file_info: Dict[str, Any], span: List[int], archive_path: Path,
+                mode: str, codec: str, error_correction: bool) -> Optional[str]:
+    """Decode and checksum one payload for a deep scan (executed in a worker process)"""
+    try:
+        # Read just this payload from the archive
+        offset, length = span
+        with open(archive_path, 'rb') as f:
+            f.seek(offset)
+            encoded_bytes = f.read(length)
+        
+        # Try to decode
+        decoded_content = _decode_payload(encoded_bytes, file_info, mode, codec, error_correction)
+        
+        # Verify checksum
+        checksum = hashlib.sha256(decoded_content).hexdigest()
+        if checksum != file_info['checksum']:
+            return f"Checksum mismatch for {file_info['name']}"
+    
+    except Exception as e:
+        return f"Decode error for {file_info['name']}: {str(e)}"
+    
+    return None
+
 class CrystalArchiveCLI:
     def __init__(self):
         self.version = "1.0.0"
@@ -53,105 +258,107 @@ class CrystalArchiveCLI:
         if input_path.is_file():
             files = [input_path]
         else:
-            files = list(input_path.rglob("*"))
-            files = [f for f in files if f.is_file()]
+            files = list(_walk_files(input_path))
         
         if not files:
             raise ValueError("No files found to encode")
         
         print(f"📊 Found {len(files)} files to encode")
         
-        # Process files
-        processed_files = []
+        # Save archive
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Identical content is encoded and stored once and shared by reference,
+        # so group files by checksum before any encoding work is done
+        groups: Dict[str, List[int]] = {}
+        for i, file_path in enumerate(files):
+            groups.setdefault(_hash_file(file_path), []).append(i)
+        unique_files = [files[indices[0]] for indices in groups.values()]
+        checksums = list(groups)
+        
+        # Process files, streaming each payload to the archive as it is encoded
+        processed_files: List[Dict[str, Any]] = [None] * len(files)
+        done = 0
         total_original_size = 0
         total_compressed_size = 0
+        total_encoded_size = 0
         
-        for i, file_path in enumerate(files, 1):
-            print(f"🔄 Processing {i}/{len(files)}: {file_path.name}")
+        with open(output_path, 'wb') as out:
+            out.write(_ARCHIVE_MAGIC)
+            payloads = []
             
-            # Read file
-            with open(file_path, 'rb') as f:
-                content = f.read()
-            
-            original_size = len(content)
-            total_original_size += original_size
-            
-            # Compress if enabled
-            if compression:
-                compressed_content = compress_data(content)
-                compressed_size = len(compressed_content)
-            else:
-                compressed_content = content
-                compressed_size = original_size
-            
-            total_compressed_size += compressed_size
-            
-            # Generate checksum
-            checksum = hashlib.sha256(content).hexdigest()
+            # Files are independent, so encode them across all cores
+            encode_one = partial(
+                _encode_one,
+                mode=_voxel_mode(profile),
+                compression=compression,
+                error_correction=error_correction,
+                input_parent=input_path.parent
+            )
+            workers = min(len(unique_files), os.cpu_count() or 1)
             
-            # 5D Optical Encoding
-            voxel_mapper = VoxelMapper()
-            mode = VoxelMode.CONSERVATIVE if profile == "A" else VoxelMode.AGGRESSIVE
-            encoded_data = voxel_mapper.encode(compressed_content, mode)
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                results = _bounded_map(ex, encode_one, unique_files, checksums,
+                                       window=2 * workers)
+                for ref, (indices, (file_info, final_encoded)) in enumerate(
+                        zip(groups.values(), results)):
+                    total_encoded_size += len(final_encoded)
+                    
+                    # Write payload now; with the bounded task window only a few
+                    # encoded files are ever held in memory
+                    payloads.append([out.tell(), len(final_encoded)])
+                    out.write(final_encoded)
+                    
+                    # Every file with this content shares the payload
+                    for i in indices:
+                        file_path = files[i]
+                        done += 1
+                        print(f"🔄 Processed {done}/{len(files)}: {file_path.name}")
+                        
+                        entry = dict(file_info, name=str(file_path.relative_to(input_path.parent)))
+                        entry['type'] = self._get_file_type(file_path)
+                        entry['data_ref'] = ref
+                        processed_files[i] = entry
+                        
+                        total_original_size += entry['original_size']
+                        total_compressed_size += entry['compressed_size']
             
-            # Error correction if enabled
-            if error_correction:
-                ldpc_encoder = LDPCEncoder()
-                rs_encoder = ReedSolomonEncoder()
-                
-                # Apply LDPC encoding
-                ldpc_encoded = ldpc_encoder.encode(encoded_data)
-                
-                # Apply Reed-Solomon encoding
-                final_encoded = rs_encoder.encode(ldpc_encoded)
-            else:
-                final_encoded = encoded_data
+            # Calculate compression ratio
+            compression_ratio = 0.0
+            if total_original_size:
+                compression_ratio = round((1 - total_compressed_size / total_original_size) * 100, 2)
             
-            processed_files.append({
-                'name': str(file_path.relative_to(input_path.parent)),
-                'type': self._get_file_type(file_path),
-                'original_size': original_size,
-                'compressed_size': compressed_size,
-                'encoded_size': len(final_encoded),
-                'checksum': checksum,
-                'data': final_encoded.hex()  # Store as hex string
-            })
-        
-        # Calculate compression ratio
-        compression_ratio = round((1 - total_compressed_size / total_original_size) * 100, 2)
-        
-        # Create manifest
-        manifest = {
-            'version': self.version,
-            'profile': profile,
-            'created': datetime.now().isoformat(),
-            'archive_id': self._generate_archive_id(),
-            'files': [f for f in processed_files],  # Remove data from manifest
-            'total_files': len(processed_files),
-            'total_original_size': total_original_size,
-            'total_compressed_size': total_compressed_size,
-            'total_encoded_size': sum(f['encoded_size'] for f in processed_files),
-            'compression_ratio': compression_ratio,
-            'error_correction_level': 'conservative' if profile == 'A' else 'aggressive',
-            'encoding_profile': {
-                'bits_per_voxel': 3 if profile == 'A' else 5,
-                'recovery_rate': 99.9999 if profile == 'A' else 99.99,
-                'durability': '1000+ years'
+            # Create manifest
+            manifest = {
+                'version': self.version,
+                'profile': profile,
+                'created': datetime.now().isoformat(),
+                'archive_id': self._generate_archive_id(),
+                'files': processed_files,
+                'payloads': payloads,
+                'total_files': len(processed_files),
+                'total_original_size': total_original_size,
+                'total_compressed_size': total_compressed_size,
+                'total_encoded_size': total_encoded_size,
+                'compression_ratio': compression_ratio,
+                'compression_codec': 'zstd' if compression else 'none',
+                'error_correction': error_correction,
+                'error_correction_level': 'conservative' if profile == 'A' else 'aggressive',
+                'encoding_profile': {
+                    'bits_per_voxel': 3 if profile == 'A' else 5,
+                    'recovery_rate': 99.9999 if profile == 'A' else 99.99,
+                    'durability': '1000+ years'
+                }
             }
-        }
-        
-        # Create archive
-        archive_data = {
-            'manifest': manifest,
-            'data': [f['data'] for f in processed_files]
-        }
-        
-        # Save archive
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            # Append the manifest and its length so readers can find it from the end
+            manifest_bytes = _json_dumps(manifest, indent=True)
+            out.write(manifest_bytes)
+            out.write(_MANIFEST_LEN.pack(len(manifest_bytes)))
         
-        with open(output_path, 'w') as f:
-            json.dump(archive_data, f, indent=2)
+        # Index the archive so listing does not have to open it
+        self._update_index(output_path, manifest)
         
         print()
         print("✅ Archive created successfully!")
@@ -176,11 +383,7 @@ class CrystalArchiveCLI:
             raise FileNotFoundError(f"Archive not found: {archive_path}")
         
         # Load archive
-        with open(archive_path, 'r') as f:
-            archive_data = json.load(f)
-        
-        manifest = archive_data['manifest']
-        data = archive_data['data']
+        manifest, payloads = _load_archive(archive_path)
         
         print(f"📊 Archive Info:")
         print(f"   Version: {manifest['version']}")
@@ -195,22 +398,23 @@ class CrystalArchiveCLI:
         output_dir.mkdir(parents=True, exist_ok=True)
         
         # Decode files
+        mode = _voxel_mode(manifest['profile'])
         decoded_files = []
-        for i, (file_info, encoded_data) in enumerate(zip(manifest['files'], data), 1):
+        for i, (file_info, encoded_bytes) in enumerate(self._file_payloads(manifest, payloads), 1):
             print(f"🔄 Decoding {i}/{len(manifest['files'])}: {file_info['name']}")
             
-            # Convert hex back to bytes
-            encoded_bytes = bytes.fromhex(encoded_data)
-            
             # 5D Optical Decoding
-            voxel_mapper = VoxelMapper()
-            mode = VoxelMode.CONSERVATIVE if manifest['profile'] == 'A' else VoxelMode.AGGRESSIVE
-            decoded_content = voxel_mapper.decode(encoded_bytes, mode)
+            decoded_content = _decode_payload(
+                encoded_bytes, file_info, mode,
+                manifest['compression_codec'], manifest['error_correction']
+            )
             
             # Verify checksum if requested
+            checksum_valid = False
             if verify:
                 checksum = hashlib.sha256(decoded_content).hexdigest()
-                if checksum != file_info['checksum']:
+                checksum_valid = checksum == file_info['checksum']
+                if not checksum_valid:
                     print(f"⚠️  Warning: Checksum mismatch for {file_info['name']}")
             
             # Save file
@@ -223,7 +427,7 @@ class CrystalArchiveCLI:
             decoded_files.append({
                 'name': file_info['name'],
                 'size': len(decoded_content),
-                'checksum_valid': verify and hashlib.sha256(decoded_content).hexdigest() == file_info['checksum']
+                'checksum_valid': checksum_valid
             })
         
         print()
@@ -248,22 +452,23 @@ class CrystalArchiveCLI:
             raise FileNotFoundError(f"Archive not found: {archive_path}")
         
         # Load archive
-        with open(archive_path, 'r') as f:
-            archive_data = json.load(f)
-        
-        manifest = archive_data['manifest']
-        data = archive_data['data']
+        manifest, payloads = _load_archive(archive_path)
         
         # Basic verification
         errors = []
         warnings = []
         
         # Check file count
-        if len(data) != manifest['total_files']:
-            errors.append(f"File count mismatch: manifest says {manifest['total_files']}, actual {len(data)}")
+        if len(manifest['files']) != manifest['total_files']:
+            errors.append(f"File count mismatch: manifest says {manifest['total_files']}, actual {len(manifest['files'])}")
         
-        # Check file sizes
-        total_size = sum(len(d) for d in data)
+        # Check payload count (duplicate files share one payload)
+        refs = {f['data_ref'] for f in manifest['files']}
+        if len(payloads) != len(refs):
+            errors.append(f"Payload count mismatch: manifest references {len(refs)}, actual {len(payloads)}")
+        
+        # Check file sizes (payloads cut short by truncation come back smaller)
+        total_size = sum(len(p) for p in payloads)
         if total_size != manifest['total_encoded_size']:
             warnings.append(f"Size mismatch: manifest says {manifest['total_encoded_size']}, actual {total_size}")
         
@@ -271,21 +476,28 @@ class CrystalArchiveCLI:
         deep_errors = []
         if deep_scan:
             print("🔬 Performing deep scan...")
-            for i, (file_info, encoded_data) in enumerate(zip(manifest['files'], data)):
-                try:
-                    # Try to decode
-                    encoded_bytes = bytes.fromhex(encoded_data)
-                    voxel_mapper = VoxelMapper()
-                    mode = VoxelMode.CONSERVATIVE if manifest['profile'] == 'A' else VoxelMode.AGGRESSIVE
-                    decoded_content = voxel_mapper.decode(encoded_bytes, mode)
-                    
-                    # Verify checksum
-                    checksum = hashlib.sha256(decoded_content).hexdigest()
-                    if checksum != file_info['checksum']:
-                        deep_errors.append(f"Checksum mismatch for {file_info['name']}")
-                
-                except Exception as e:
-                    deep_errors.append(f"Decode error for {file_info['name']}: {str(e)}")
+            # Shared payloads only need to be checked once
+            scanned = set()
+            to_scan = []
+            for file_info, span in self._file_payloads(manifest, manifest['payloads']):
+                if file_info['checksum'] not in scanned:
+                    scanned.add(file_info['checksum'])
+                    to_scan.append((file_info, span))
+            
+            # Payloads are independent, so scan them across all cores; workers
+            # read their own payload from the archive rather than receiving it
+            if to_scan:
+                verify_one = partial(
+                    _verify_one,
+                    archive_path=archive_path,
+                    mode=_voxel_mode(manifest['profile']),
+                    codec=manifest['compression_codec'],
+                    error_correction=manifest['error_correction']
+                )
+                workers = min(len(to_scan), os.cpu_count() or 1)
+                with ProcessPoolExecutor(max_workers=workers) as ex:
+                    results = ex.map(verify_one, *zip(*to_scan))
+                    deep_errors = [error for error in results if error is not None]
         
         # Calculate health score
         health_score = 100
@@ -334,24 +546,28 @@ class CrystalArchiveCLI:
         print(f"📁 Archives directory: {self.archives_dir}")
         print()
         
+        # The index caches each archive's summary with the stat it was taken
+        # from, so only new or rewritten archives have their manifest read
+        index = self._load_index()
+        fresh_index = {}
         archives = []
         for archive_file in self.archives_dir.glob("*.crystal"):
+            key = str(archive_file.resolve())
             try:
-                with open(archive_file, 'r') as f:
-                    archive_data = json.load(f)
-                
-                manifest = archive_data['manifest']
-                archives.append({
-                    'archive_id': manifest['archive_id'],
-                    'created': manifest['created'],
-                    'files': manifest['total_files'],
-                    'size': manifest['total_compressed_size'],
-                    'compression': manifest['compression_ratio'],
-                    'profile': manifest['profile'],
-                    'path': str(archive_file)
-                })
+                st = archive_file.stat()
+                entry = index.get(key)
+                if entry is None or entry.get('stat') != [st.st_mtime_ns, st.st_size]:
+                    manifest = self._read_manifest(archive_file)
+                    entry = self._index_entry(manifest, archive_file, st)
             except Exception as e:
                 print(f"⚠️  Error reading {archive_file.name}: {e}")
+                continue
+            fresh_index[key] = entry
+            archives.append(entry['summary'])
+        
+        # Drop removed archives and record re-read ones
+        if fresh_index != index:
+            self._write_index(fresh_index)
         
         if not archives:
             print("No archives found")
@@ -371,24 +587,69 @@ class CrystalArchiveCLI:
         
         return archives
     
+    def _file_payloads(self, manifest: Dict[str, Any], payloads: List[Any]) -> List[Tuple[Dict[str, Any], Any]]:
+        """Pair each manifest file entry with its payload"""
+        return [(f, payloads[f['data_ref']]) for f in manifest['files']]
+    
+    def _read_manifest(self, archive_path: Path) -> Dict[str, Any]:
+        """Read an archive's manifest from its trailer without touching the payloads"""
+        with open(archive_path, 'rb') as f:
+            return _read_archive_manifest(f)
+    
+    def _archive_summary(self, manifest: Dict[str, Any], archive_path: Path) -> Dict[str, Any]:
+        """Build the listing entry for an archive"""
+        return {
+            'archive_id': manifest['archive_id'],
+            'created': manifest['created'],
+            'files': manifest['total_files'],
+            'size': manifest['total_compressed_size'],
+            'compression': manifest['compression_ratio'],
+            'profile': manifest['profile'],
+            'path': str(archive_path)
+        }
+    
+    def _index_entry(self, manifest: Dict[str, Any], archive_path: Path,
+                     st: os.stat_result) -> Dict[str, Any]:
+        """Build an index entry: the listing summary plus the stat it is valid for"""
+        return {
+            'stat': [st.st_mtime_ns, st.st_size],
+            'summary': self._archive_summary(manifest, archive_path)
+        }
+    
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the archive index, keyed by resolved archive path"""
+        index_path = self.archives_dir / 'index.json'
+        if not index_path.exists():
+            return {}
+        try:
+            with open(index_path, 'rb') as f:
+                return _json_load(f)
+        except ValueError:
+            print(f"⚠️  Ignoring corrupt archive index: {index_path}")
+            return {}
+    
+    def _update_index(self, archive_path: Path, manifest: Dict[str, Any]):
+        """Record an archive in the index if it lives in the archives directory"""
+        # Listing only globs the archives directory, so index nothing else
+        resolved = archive_path.resolve()
+        if resolved.parent != self.archives_dir.resolve() or resolved.suffix != '.crystal':
+            return
+        index = self._load_index()
+        index[str(resolved)] = self._index_entry(manifest, archive_path, archive_path.stat())
+        self._write_index(index)
+    
+    def _write_index(self, index: Dict[str, Dict[str, Any]]):
+        """Replace the archive index"""
+        # Write to a temporary file first so a crash can't truncate the index
+        index_path = self.archives_dir / 'index.json'
+        tmp_path = index_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(_json_dumps(index, indent=True))
+        os.replace(tmp_path, index_path)
+    
     def _get_file_type(self, file_path: Path) -> str:
         """Get file type based on extension"""
-        suffix = file_path.suffix.lower()
-        type_map = {
-            '.txt': 'text/plain',
-            '.md': 'text/markdown',
-            '.json': 'application/json',
-            '.csv': 'text/csv',
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif',
-            '.pdf': 'application/pdf',
-            '.doc': 'application/msword',
-            '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            '.zip': 'application/zip',
-        }
-        return type_map.get(suffix, 'application/octet-stream')
+        return _FILE_TYPES.get(file_path.suffix.lower(), 'application/octet-stream')
     
     def _generate_archive_id(self) -> str:
         """Generate a unique archive ID"""
@@ -396,11 +657,9 @@ class CrystalArchiveCLI:
     
     def _format_size(self, size: int) -> str:
         """Format size in human readable format"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size < 1024.0:
-                return f"{size:.1f} {unit}"
-            size /= 1024.0
-        return f"{size:.1f} PB"
+        # Each unit step is 10 bits, so the unit comes straight from the bit length
+        idx = min((max(int(size), 1).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size / (1 << (idx * 10)):.1f} {_SIZE_UNITS[idx]}"
 
 def main():
     parser = argparse.ArgumentParser(
@@ -3,30 +3,18 @@
 import json
 import hashlib
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from pathlib import Path
 
+# orjson is much faster for large file lists; fall back to stdlib json if absent
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-class Manifest:
-    """OAIS-compliant manifest with decoding instructions."""
-    
-    VERSION = "1.0.0"
-    
-    def __init__(self):
-        """Initialize empty manifest."""
-        self.data = {
-            "version": self.VERSION,
-            "created": datetime.utcnow().isoformat(),
-            "profile": None,
-            "encoding": {},
-            "integrity": {},
-            "files": [],
-            "instructions": self._get_instructions()
-        }
-    
-    def _get_instructions(self) -> str:
-        """Get human-readable decoding instructions."""
-        return """
+
+# Human-readable decoding instructions embedded in every manifest
+INSTRUCTIONS = """
 Crystal Archive Decoding Instructions
 ======================================
 
@@ -52,6 +40,24 @@ Crystal Archive Decoding Instructions
 
 See full specification in docs/SPEC.md
 """
+
+
+class Manifest:
+    """OAIS-compliant manifest with decoding instructions."""
+    
+    VERSION = "1.1.0"
+    
+    def __init__(self):
+        """Initialize empty manifest."""
+        self.data = {
+            "version": self.VERSION,
+            "created": datetime.utcnow().isoformat(),
+            "profile": None,
+            "encoding": {},
+            "integrity": {},
+            "files": [],
+            "instructions": INSTRUCTIONS
+        }
     
     def set_profile(self, profile: str, params: Dict[str, Any]):
         """Set encoding profile."""
@@ -79,7 +85,8 @@ See full specification in docs/SPEC.md
             "bits_per_voxel": params.get("bits_per_voxel"),
             "orientations": params.get("orientations"),
             "retardance_levels": params.get("retardance_levels"),
-            "gray_codes": params.get("gray_codes", {})
+            "gray_codes": params.get("gray_codes", {}),
+            "quantization": params.get("quantization")
         }
     
     def set_interleaving(self, seed: int, span: int, depth: int):
@@ -90,6 +97,15 @@ See full specification in docs/SPEC.md
             "depth": depth
         }
     
+    def set_layout(self, n_shards: int, shard_size: int, blocks_per_shard: int, total_bits: int):
+        """Set bitstream layout: shards, LDPC blocks per shard, and coded length."""
+        self.data["encoding"]["layout"] = {
+            "n_shards": n_shards,
+            "shard_size": shard_size,
+            "blocks_per_shard": blocks_per_shard,
+            "total_bits": total_bits
+        }
+    
     def set_geometry(self, tiles_x: int, tiles_y: int, planes: int):
         """Set crystal geometry."""
         self.data["geometry"] = {
@@ -119,27 +135,64 @@ See full specification in docs/SPEC.md
             "signature": signature
         }
     
+    def _canonical_chunks(self) -> Iterator[bytes]:
+        """
+        Serialize the hashed fields as compact, key-sorted JSON.
+        
+        Always uses stdlib json: orjson formats some floats differently and
+        orders non-string keys differently, so the hash must not depend on
+        whether it is installed. The top-level object is emitted one entry
+        at a time, so the hash can be fed incrementally without copying the
+        manifest or building the whole document.
+        """
+        def dumps(value):
+            return json.dumps(
+                value, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+            ).encode()
+        
+        # Hash without the hash field itself
+        yield b"{"
+        separator = b""
+        for key in sorted(self.data):
+            if key != "integrity":
+                yield separator + dumps(key) + b":" + dumps(self.data[key])
+                separator = b","
+        yield b"}"
+    
     def compute_hash(self) -> str:
         """Compute SHA-256 hash of manifest."""
-        # Hash without the hash field itself
+        sha = hashlib.sha256()
+        for chunk in self._canonical_chunks():
+            sha.update(chunk)
+        return sha.hexdigest()
+    
+    def _legacy_hash(self) -> str:
+        """Hash as written by older versions (json.dumps with default separators)."""
         data_copy = self.data.copy()
         data_copy.pop("integrity", None)
-        json_str = json.dumps(data_copy, sort_keys=True)
-        return hashlib.sha256(json_str.encode()).hexdigest()
+        return hashlib.sha256(json.dumps(data_copy, sort_keys=True).encode()).hexdigest()
     
     def save(self, path: Path):
         """Save manifest to JSON file."""
         # Add self-hash
         self.data["integrity"]["manifest_hash"] = self.compute_hash()
         
-        with open(path, "w") as f:
-            json.dump(self.data, f, indent=2)
+        if orjson is not None:
+            Path(path).write_bytes(
+                orjson.dumps(self.data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
+        else:
+            with open(path, "w") as f:
+                json.dump(self.data, f, indent=2)
     
     @classmethod
     def load(cls, path: Path) -> "Manifest":
         """Load manifest from JSON file."""
-        with open(path) as f:
-            data = json.load(f)
+        if orjson is not None:
+            data = orjson.loads(Path(path).read_bytes())
+        else:
+            with open(path) as f:
+                data = json.load(f)
         
         manifest = cls()
         manifest.data = data
@@ -148,7 +201,7 @@ See full specification in docs/SPEC.md
         stored_hash = data.get("integrity", {}).get("manifest_hash")
         if stored_hash:
             computed_hash = manifest.compute_hash()
-            if stored_hash != computed_hash:
+            if stored_hash != computed_hash and stored_hash != manifest._legacy_hash():
                 raise ValueError("Manifest integrity check failed")
         
         return manifest
\ No newline at end of file
@@ -3,8 +3,11 @@
 import numpy as np
 from pathlib import Path
 from typing import Dict, Any, Tuple, Optional, List
-import json
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
+import json
+import mmap
+import os
 
 from ..packer import pack_folder_to_bytes, unpack_bytes_to_folder
 from ..codecs.compression import compress_data, decompress_data
@@ -25,7 +28,7 @@ PROFILE_A = {
     "interleave_span": 10000,
     "interleave_depth": 16,
     "compression": "zstd",
-    "compression_level": 6
+    "compression_level": 3
 }
 
 PROFILE_B = {
@@ -36,10 +39,75 @@ PROFILE_B = {
     "interleave_span": 5000,
     "interleave_depth": 8,
     "compression": "zstd",
-    "compression_level": 9
+    "compression_level": 6
 }
 
 
+# Single binary file holding every voxel, in tile order
+VOXEL_FILE = "voxels.npz"
+
+# Stored voxels are quantized to uint8: value * scale, rounded. Angles span
+# [0, 180) degrees and retardances at most one wavelength, so constellation
+# points stay far apart after quantization
+ANGLE_QUANT_SCALE = 255 / 180
+RETARDANCE_QUANT_SCALE = 255
+
+# Chunk size for streaming recovered files through SHA-256
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def _file_sha256(file_path: Path) -> str:
+    """Hash a file through a read-only mmap, one chunk per update."""
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                for i in range(0, len(view), HASH_CHUNK_SIZE):
+                    sha.update(view[i:i + HASH_CHUNK_SIZE])
+                view.release()
+    return sha.hexdigest()
+
+
+def _load_voxels(
+    voxels_path: Path,
+    quantization: Dict[str, Any]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Read symbols, angles and retardances from an archive's voxels directory.
+    
+    Archives written before manifest version 1.1.0 hold one JSON file per
+    tile (plane_*/tile_*.json, float voxels) instead of VOXEL_FILE.
+    """
+    voxel_file = voxels_path / VOXEL_FILE
+    if voxel_file.exists():
+        with np.load(voxel_file) as voxel_data:
+            symbols = voxel_data["symbols"]
+            angles = voxel_data["angles"] / np.float32(quantization.get("angle_scale", 1))
+            retardances = voxel_data["retardances"] / np.float32(
+                quantization.get("retardance_scale", 1)
+            )
+        return symbols, angles, retardances
+    
+    tile_paths = sorted(voxels_path.glob("plane_*/tile_*.json"))
+    if not tile_paths:
+        raise ValueError(
+            f"No voxel data in {voxels_path}: expected {VOXEL_FILE} or plane_*/tile_*.json"
+        )
+    
+    all_symbols = []
+    all_angles = []
+    all_retardances = []
+    for tile_path in tile_paths:
+        with open(tile_path) as f:
+            tile_data = json.load(f)
+        all_symbols.extend(tile_data["symbols"])
+        all_angles.extend(tile_data["angles"])
+        all_retardances.extend(tile_data["retardances"])
+    
+    return np.array(all_symbols), np.array(all_angles), np.array(all_retardances)
+
+
 def encode_folder(
     folder: Path,
     output_dir: Path,
@@ -84,28 +152,21 @@ def encode_folder(
     # Step 3: Create shards with Reed-Solomon
     print("  Creating error correction shards...")
     rs_codec = ReedSolomonCodec()
-    shards = rs_codec.create_shards(compressed, shard_size=4096)
+    # Shards stay one (n_shards, shard_size) array; the compressed bytes are
+    # read through a memoryview and never copied per shard
+    shards = rs_codec.create_shard_matrix(memoryview(compressed), shard_size=4096)
     
     # Step 4: Apply LDPC to each shard
     print("  Applying LDPC encoding...")
     ldpc = SimpleLDPC(n=1024, k=int(1024 * profile_params["ldpc_rate"]))
-    encoded_shards = []
     
-    for shard in shards:
-        # Convert to bits
-        shard_bits = np.unpackbits(np.frombuffer(shard, dtype=np.uint8))
-        
-        # Encode in blocks
-        encoded_blocks = []
-        for i in range(0, len(shard_bits), ldpc.k):
-            block = shard_bits[i:i+ldpc.k]
-            if len(block) < ldpc.k:
-                block = np.pad(block, (0, ldpc.k - len(block)))
-            encoded = ldpc.encode(block)
-            encoded_blocks.append(encoded)
-        
-        encoded_shard = np.concatenate(encoded_blocks) if encoded_blocks else np.array([], dtype=np.uint8)
-        encoded_shards.append(encoded_shard)
+    # Each shard is padded to whole blocks; shards share one size, so every
+    # block of every shard is encoded in a single batch. unpackbits writes
+    # the zero padding itself, so the bits are laid out exactly once
+    shard_len = shards.shape[1]
+    blocks_per_shard = -(-shard_len * 8 // ldpc.k)
+    blocks = np.unpackbits(shards, axis=1, count=blocks_per_shard * ldpc.k)
+    encoded = ldpc.encode_batch(blocks.reshape(-1, ldpc.k))
     
     # Step 5: Interleave
     print("  Interleaving...")
@@ -116,7 +177,7 @@ def encode_folder(
     )
     
     # Concatenate all shards for interleaving
-    all_bits = np.concatenate(encoded_shards) if encoded_shards else np.array([], dtype=np.uint8)
+    all_bits = encoded.ravel()
     interleaved, perm_indices = interleaver.block_interleave(all_bits)
     
     # Step 6: Map to voxels
@@ -132,31 +193,16 @@ def encode_folder(
     tiles_per_plane = 64
     n_planes = (n_tiles + tiles_per_plane - 1) // tiles_per_plane
     
-    # Save voxel data
+    # Save voxel data as three contiguous arrays; tiles and planes are
+    # fixed-size slices of them, so the layout lives in the manifest only
     voxel_dir = output_dir / "voxels"
     voxel_dir.mkdir(exist_ok=True)
-    
-    for plane_idx in range(n_planes):
-        plane_dir = voxel_dir / f"plane_{plane_idx:03d}"
-        plane_dir.mkdir(exist_ok=True)
-        
-        for tile_idx in range(tiles_per_plane):
-            global_tile_idx = plane_idx * tiles_per_plane + tile_idx
-            if global_tile_idx >= n_tiles:
-                break
-            
-            start = global_tile_idx * tile_size
-            end = min(start + tile_size, len(symbols))
-            
-            tile_data = {
-                "symbols": symbols[start:end].tolist(),
-                "angles": angles[start:end].tolist(),
-                "retardances": retardances[start:end].tolist()
-            }
-            
-            tile_path = plane_dir / f"tile_{tile_idx:04d}.json"
-            with open(tile_path, "w") as f:
-                json.dump(tile_data, f)
+    np.savez(
+        voxel_dir / VOXEL_FILE,
+        symbols=symbols,
+        angles=np.round(angles * ANGLE_QUANT_SCALE).astype(np.uint8),
+        retardances=np.round(retardances * RETARDANCE_QUANT_SCALE).astype(np.uint8)
+    )
     
     # Step 8: Create manifest
     print("  Creating manifest...")
@@ -170,18 +216,23 @@ def encode_folder(
     manifest.set_voxel_mapping(profile_params["voxel_mode"], {
         "bits_per_voxel": voxel_mapper.bits_per_voxel,
         "orientations": voxel_mapper.orientations,
-        "retardance_levels": voxel_mapper.retardance_levels
+        "retardance_levels": voxel_mapper.retardance_levels,
+        "quantization": {
+            "dtype": "uint8",
+            "angle_scale": ANGLE_QUANT_SCALE,
+            "retardance_scale": RETARDANCE_QUANT_SCALE
+        }
     })
     manifest.set_interleaving(seed, profile_params["interleave_span"], profile_params["interleave_depth"])
+    manifest.set_layout(len(shards), shard_len, blocks_per_shard, all_bits.size)
     manifest.set_geometry(8, 8, n_planes)
     
     # Add file metadata
     for file_info in file_metadata["files"]:
         manifest.add_file(file_info["path"], file_info["size"], file_info["sha256"])
     
-    # Create Merkle tree
-    shard_bytes = [shard.tobytes() if hasattr(shard, 'tobytes') else bytes(shard) for shard in shards]
-    merkle_tree = MerkleTree(shard_bytes)
+    # Create Merkle tree; each shard row is hashed in place, in parallel
+    merkle_tree = MerkleTree(list(shards))
     manifest.set_merkle_root(merkle_tree.get_root())
     
     # Save manifest
@@ -226,22 +277,8 @@ def decode_archive(
     
     # Step 1: Read voxel data
     print("  Reading voxel data...")
-    all_symbols = []
-    all_angles = []
-    all_retardances = []
-    
-    voxels_path = voxel_dir / "voxels"
-    for plane_dir in sorted(voxels_path.glob("plane_*")):
-        for tile_path in sorted(plane_dir.glob("tile_*.json")):
-            with open(tile_path) as f:
-                tile_data = json.load(f)
-            all_symbols.extend(tile_data["symbols"])
-            all_angles.extend(tile_data["angles"])
-            all_retardances.extend(tile_data["retardances"])
-    
-    symbols = np.array(all_symbols, dtype=np.uint8)
-    angles = np.array(all_angles, dtype=float)
-    retardances = np.array(all_retardances, dtype=float)
+    quantization = manifest.data["encoding"]["voxel"].get("quantization") or {}
+    symbols, angles, retardances = _load_voxels(voxel_dir / "voxels", quantization)
     
     # Step 2: Demap voxels to bits
     print("  Demapping voxels...")
@@ -259,30 +296,33 @@ def decode_archive(
         seed=interleave_params["seed"]
     )
     
+    # LDPC parameters fix the block layout, so deinterleave straight into
+    # the zero-padded block buffer the decoder consumes. The recorded
+    # layout gives the exact coded length, excluding symbol padding
+    layout = manifest.data["encoding"].get("layout")
+    ldpc = SimpleLDPC(n=ldpc_params["n"], k=ldpc_params["k"])
+    n_bits = layout["total_bits"] if layout else len(bits_interleaved)
+    n_blocks = -(-n_bits // ldpc.n)
+    blocks = np.zeros((n_blocks, ldpc.n), dtype=np.uint8)
+    
     # Generate same permutation
-    rng = np.random.default_rng(interleave_params["seed"])
-    perm = rng.permutation(len(bits_interleaved))
-    bits_encoded = interleaver.block_deinterleave(bits_interleaved, perm)
+    perm = interleaver.permutation(n_bits)
+    interleaver.block_deinterleave(
+        bits_interleaved[:n_bits], perm, out=blocks.reshape(-1)[:n_bits]
+    )
     
     # Step 4: LDPC decode
     print("  LDPC decoding...")
-    ldpc = SimpleLDPC(n=ldpc_params["n"], k=ldpc_params["k"])
-    
-    decoded_bits = []
-    block_size = ldpc.n
     
-    for i in range(0, len(bits_encoded), block_size):
-        block = bits_encoded[i:i+block_size]
-        if len(block) < block_size:
-            block = np.pad(block, (0, block_size - len(block)))
-        
-        # Decode (hard decision for simplicity)
-        decoded, success = ldpc.decode_hard(block)
-        decoded_bits.append(decoded)
+    # Decode all blocks in one batch (hard decision for simplicity)
+    decoded, success = ldpc.decode_hard_batch(blocks)
     
-    # Convert back to bytes
-    all_decoded = np.concatenate(decoded_bits) if decoded_bits else np.array([], dtype=np.uint8)
-    decoded_bytes = np.packbits(all_decoded).tobytes()
+    # Convert back to bytes, dropping each shard's block padding
+    if layout:
+        shard_bits = decoded.reshape(layout["n_shards"], -1)[:, :layout["shard_size"] * 8]
+    else:
+        shard_bits = decoded
+    decoded_bytes = np.packbits(shard_bits).tobytes()
     
     # Step 5: Reed-Solomon decode
     print("  Reed-Solomon decoding...")
@@ -303,11 +343,14 @@ def decode_archive(
     
     # Verify file hashes
     print("  Verifying integrity...")
-    for file_info in manifest.data["files"]:
+    def verify(file_info: Dict[str, Any]) -> bool:
         file_path = output_dir / file_info["path"]
-        if file_path.exists():
-            actual_hash = hashlib.sha256(file_path.read_bytes()).hexdigest()
-            if actual_hash != file_info["sha256"]:
+        return not file_path.exists() or _file_sha256(file_path) == file_info["sha256"]
+    
+    # hashlib releases the GIL while hashing, so files verify in parallel
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for file_info, ok in zip(manifest.data["files"], pool.map(verify, manifest.data["files"])):
+            if not ok:
                 print(f"    Warning: Hash mismatch for {file_info['path']}")
     
     print(f"Decoding complete. Files recovered to: {output_dir}")
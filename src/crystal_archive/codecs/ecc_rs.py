@@ -1,9 +1,40 @@
 """Reed-Solomon erasure coding."""
 
 import numpy as np
-import reedsolo
+from functools import lru_cache
 from typing import List, Optional
 
+# creedsolo is the compiled build of reedsolo with the same API and runs
+# decoding an order of magnitude faster; fall back to pure Python if absent
+try:
+    import creedsolo as reedsolo
+except ImportError:
+    import reedsolo
+
+
+# Primitive polynomial of GF(2^8) used by reedsolo's defaults
+GF_PRIM = 0x11d
+
+
+@lru_cache(maxsize=1)
+def _gf_mul_table() -> np.ndarray:
+    """Full 256x256 GF(2^8) multiplication table, built from log/antilog tables."""
+    exp = np.zeros(512, dtype=np.int32)
+    log = np.zeros(256, dtype=np.int32)
+    x = 1
+    for i in range(255):
+        exp[i] = x
+        log[x] = i
+        x <<= 1
+        if x & 0x100:
+            x ^= GF_PRIM
+    exp[255:510] = exp[:255]
+    
+    table = exp[log[:, None] + log[None, :]].astype(np.uint8)
+    table[0, :] = 0
+    table[:, 0] = 0
+    return table
+
 
 class ReedSolomonCodec:
     """Reed-Solomon codec wrapper for erasure coding."""
@@ -20,24 +51,30 @@ class ReedSolomonCodec:
         self.k = k
         self.nsym = n - k  # Number of parity symbols
         self.rs = reedsolo.RSCodec(self.nsym)
+        
+        # Products of every byte with each non-leading generator coefficient,
+        # so one table gather multiplies a whole column of chunks at once
+        generator = np.frombuffer(bytes(self.rs.gen[self.nsym]), dtype=np.uint8)
+        self._gen_products = _gf_mul_table()[:, generator[1:]]
     
     def encode(self, data: bytes) -> bytes:
         """Add RS parity symbols to data."""
-        # Split data into chunks if needed
-        chunks = []
-        chunk_size = self.k
+        # Split data into chunks, padding the last one
+        n_chunks = (len(data) + self.k - 1) // self.k
+        messages = np.zeros((n_chunks, self.k), dtype=np.uint8)
+        messages.reshape(-1)[:len(data)] = np.frombuffer(data, dtype=np.uint8)
         
-        for i in range(0, len(data), chunk_size):
-            chunk = data[i:i+chunk_size]
-            # Pad if necessary
-            if len(chunk) < chunk_size:
-                chunk = chunk + b'\x00' * (chunk_size - len(chunk))
-            
-            # Encode chunk
-            encoded = self.rs.encode(chunk)
-            chunks.append(encoded)
+        # Systematic encoding: the parity is the remainder of message * x^nsym
+        # divided by the generator, computed by an LFSR that steps every
+        # chunk in lockstep
+        remainder = np.zeros((n_chunks, self.nsym), dtype=np.uint8)
+        for i in range(self.k):
+            feedback = messages[:, i] ^ remainder[:, 0]
+            remainder[:, :-1] = remainder[:, 1:]
+            remainder[:, -1] = 0
+            remainder ^= self._gen_products[feedback]
         
-        return b''.join(chunks)
+        return np.hstack([messages, remainder]).tobytes()
     
     def decode(self, encoded_data: bytes, errors_pos: Optional[List[int]] = None) -> Optional[bytes]:
         """
@@ -70,43 +107,42 @@ class ReedSolomonCodec:
         
         return b''.join(chunks)
     
-    def create_shards(self, data: bytes, shard_size: int = 1024) -> List[bytes]:
+    def create_shard_matrix(self, data: bytes, shard_size: int = 1024) -> np.ndarray:
         """
-        Split data into shards with RS parity.
+        Split data into shards with RS parity, one shard per row.
         
         Args:
-            data: Input data
+            data: Input data (any bytes-like object; it is read in place)
             shard_size: Size of each data shard
             
         Returns:
-            List of shards (data + parity)
+            (num_shards, shard_size) uint8 array (data rows, then parity rows)
         """
         # Calculate number of data shards
         num_data_shards = (len(data) + shard_size - 1) // shard_size
         num_parity_shards = int(num_data_shards * (self.n / self.k - 1))
         
-        shards = []
-        
-        # Create data shards
-        for i in range(num_data_shards):
-            start = i * shard_size
-            end = min(start + shard_size, len(data))
-            shard = data[start:end]
-            
-            # Pad last shard if needed
-            if len(shard) < shard_size:
-                shard = shard + b'\x00' * (shard_size - len(shard))
-            
-            shards.append(shard)
+        # Create data shards, padding the last one
+        shards = np.zeros((num_data_shards + num_parity_shards, shard_size), dtype=np.uint8)
+        shards[:num_data_shards].reshape(-1)[:len(data)] = np.frombuffer(data, dtype=np.uint8)
         
         # Create parity shards (simplified XOR for demo)
         # In practice, use proper RS or fountain codes
-        for i in range(num_parity_shards):
-            parity = bytearray(shard_size)
-            for j, shard in enumerate(shards[:num_data_shards]):
-                # Simple XOR parity (replace with proper RS)
-                for k in range(shard_size):
-                    parity[k] ^= shard[k]
-            shards.append(bytes(parity))
+        # Every parity shard is the same XOR of all data shards, so reduce once
+        if num_parity_shards:
+            shards[num_data_shards:] = np.bitwise_xor.reduce(shards[:num_data_shards], axis=0)
+        
+        return shards
+    
+    def create_shards(self, data: bytes, shard_size: int = 1024) -> List[bytes]:
+        """
+        Split data into shards with RS parity.
         
-        return shards
\ No newline at end of file
+        Args:
+            data: Input data
+            shard_size: Size of each data shard
+            
+        Returns:
+            List of shards (data + parity)
+        """
+        return [row.tobytes() for row in self.create_shard_matrix(data, shard_size)]
\ No newline at end of file
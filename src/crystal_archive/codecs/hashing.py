@@ -1,9 +1,29 @@
 """Integrity checking with SHA-256 and Merkle trees."""
 
-import hashlib
+import os
+from hashlib import sha256 as _sha256
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 
 
+# Size of a SHA-256 digest; each tree level is stored as a flat run of these
+DIGEST_SIZE = _sha256().digest_size
+
+# Levels with fewer nodes than this are hashed serially to avoid dispatch overhead
+PARALLEL_MIN_NODES = 64
+
+# hashlib only releases the GIL for buffers at least this large, so smaller
+# chunks (including every internal digest group) are hashed serially
+PARALLEL_MIN_CHUNK = 2048
+
+
+@lru_cache(maxsize=1)
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared hashing thread pool (hashlib releases the GIL while hashing)."""
+    return ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
 class MerkleTree:
     """Simple Merkle tree implementation for data integrity."""
     
@@ -12,36 +32,61 @@ class MerkleTree:
         Build Merkle tree from data leaves.
         
         Args:
-            leaves: List of data chunks
+            leaves: List of data chunks (any bytes-like objects, e.g.
+                memoryview slices of one buffer)
             fanout: Number of children per node (usually 2)
         """
         self.leaves = leaves
         self.fanout = fanout
         self.tree = self._build_tree()
-        self.root = self.tree[-1][0] if self.tree else b""
+        self.root = self.tree[-1][:DIGEST_SIZE] if self.tree else b""
     
     def _hash(self, data: bytes) -> bytes:
         """Compute hash of data."""
-        return hashlib.sha256(data).digest()
+        return _sha256(data).digest()
     
-    def _build_tree(self) -> List[List[bytes]]:
-        """Build the Merkle tree bottom-up."""
+    def _hash_all(self, chunks: List[bytes]) -> bytes:
+        """Hash each chunk independently and concatenate the digests."""
+        hash_ = self._hash
+        if (
+            len(chunks) < PARALLEL_MIN_NODES
+            or len(chunks[0]) < PARALLEL_MIN_CHUNK
+            or (os.cpu_count() or 1) == 1
+        ):
+            return b"".join([hash_(chunk) for chunk in chunks])
+        return b"".join(_get_executor().map(hash_, chunks))
+    
+    def _node(self, level: bytes, index: int) -> bytes:
+        """Get the hash of node index within a flat level buffer."""
+        return level[index * DIGEST_SIZE:(index + 1) * DIGEST_SIZE]
+    
+    def _level_size(self, level: bytes) -> int:
+        """Get the number of nodes in a flat level buffer."""
+        return len(level) // DIGEST_SIZE
+    
+    def _build_tree(self) -> List[bytes]:
+        """
+        Build the Merkle tree bottom-up.
+        
+        Each level is one contiguous buffer of concatenated digests, so a
+        group of siblings is hashed straight from a slice of its level.
+        """
         if not self.leaves:
             return []
         
         # Start with hashes of leaves
-        current_level = [self._hash(leaf) for leaf in self.leaves]
+        current_level = self._hash_all(self.leaves)
         tree = [current_level]
         
-        # Build up the tree
-        while len(current_level) > 1:
-            next_level = []
-            for i in range(0, len(current_level), self.fanout):
-                # Combine up to 'fanout' nodes
-                group = current_level[i:i+self.fanout]
-                combined = b"".join(group)
-                next_level.append(self._hash(combined))
-            current_level = next_level
+        # Build up the tree; digest groups are tiny, so hash them serially
+        hash_ = self._hash
+        group_span = self.fanout * DIGEST_SIZE
+        while len(current_level) > DIGEST_SIZE:
+            # Combine up to 'fanout' nodes
+            view = memoryview(current_level)
+            current_level = b"".join([
+                hash_(view[i:i + group_span]) for i in range(0, len(current_level), group_span)
+            ])
             tree.append(current_level)
         
         return tree
@@ -68,9 +113,9 @@ class MerkleTree:
             group_index = current_index // self.fanout
             group_start = group_index * self.fanout
             
-            for i in range(group_start, min(group_start + self.fanout, len(level))):
+            for i in range(group_start, min(group_start + self.fanout, self._level_size(level))):
                 if i != current_index:
-                    proof.append(level[i].hex())
+                    proof.append(self._node(level, i).hex())
             
             current_index = group_index
         
@@ -90,7 +135,7 @@ class MerkleTree:
             # Reconstruct group hash
             group_hashes = []
             for i in range(self.fanout):
-                if group_start + i >= len(self.tree[level_num]):
+                if group_start + i >= self._level_size(self.tree[level_num]):
                     break
                 if i == position_in_group:
                     group_hashes.append(current_hash)
@@ -1,7 +1,24 @@
 """Interleaving for burst error protection."""
 
 import numpy as np
-from typing import Tuple
+from typing import Dict, Optional, Tuple
+
+
+def _roll_rows(matrix: np.ndarray, direction: int) -> np.ndarray:
+    """
+    Roll row i of a (rows, cols) matrix by direction * i * (cols // rows),
+    equivalent to np.roll on every row.
+    
+    Each row is two slice copies, so no index array the size of the data
+    is built; there are only `depth` rows.
+    """
+    rows, cols = matrix.shape
+    out = np.empty_like(matrix)
+    for i in range(rows):
+        shift = (direction * i * (cols // rows)) % cols if cols else 0
+        out[i, shift:] = matrix[i, :cols - shift]
+        out[i, :shift] = matrix[i, cols - shift:]
+    return out
 
 
 class Interleaver:
@@ -20,25 +37,57 @@ class Interleaver:
         self.depth = depth
         self.seed = seed
         self.rng = np.random.default_rng(seed)
+        
+        # Block permutations by data length; the seed is fixed, so each one
+        # only needs to be generated once
+        self._perm_cache: Dict[int, np.ndarray] = {}
     
-    def block_interleave(self, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    def permutation(self, n: int) -> np.ndarray:
+        """
+        Pseudo-random block permutation of length n for this seed.
+        
+        Equal to np.random.default_rng(seed).permutation(n), so a decoder can
+        regenerate it from the manifest. Cached per length and read-only.
+        """
+        perm = self._perm_cache.get(n)
+        if perm is None:
+            perm = np.random.default_rng(self.seed).permutation(n)
+            perm.flags.writeable = False
+            self._perm_cache[n] = perm
+        return perm
+    
+    def block_interleave(
+        self,
+        data: np.ndarray,
+        out: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Block interleaving with pseudo-random permutation.
         
+        Args:
+            data: Data to interleave
+            out: Optional preallocated output buffer (same length as data)
+            
         Returns:
             (interleaved_data, permutation_indices)
         """
         # Generate permutation
-        perm = self.rng.permutation(len(data))
-        interleaved = data[perm]
+        perm = self.permutation(len(data))
+        interleaved = np.take(data, perm, out=out)
         return interleaved, perm
     
-    def block_deinterleave(self, data: np.ndarray, perm: np.ndarray) -> np.ndarray:
+    def block_deinterleave(
+        self,
+        data: np.ndarray,
+        perm: np.ndarray,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """Reverse block interleaving."""
-        # Inverse permutation
-        inv_perm = np.empty_like(perm)
-        inv_perm[perm] = np.arange(len(perm))
-        return data[inv_perm]
+        # Scatter through the permutation instead of building its inverse
+        if out is None:
+            out = np.empty_like(data)
+        out[perm] = data
+        return out
     
     def convolutional_interleave(self, data: np.ndarray) -> np.ndarray:
         """
@@ -59,14 +108,10 @@ class Interleaver:
         matrix = padded.reshape(rows, cols)
         
         # Apply delays
-        interleaved = []
-        for i in range(rows):
-            delay = i * (cols // rows)
-            row = np.roll(matrix[i], delay)
-            interleaved.append(row)
+        interleaved = _roll_rows(matrix, 1)
         
         # Flatten back
-        result = np.concatenate(interleaved)
+        result = interleaved.ravel()
         return result[:n]  # Remove padding
     
     def convolutional_deinterleave(self, data: np.ndarray) -> np.ndarray:
@@ -84,13 +129,8 @@ class Interleaver:
         interleaved = padded.reshape(-1, rows).T
         
         # Reverse delays
-        deinterleaved = []
-        for i in range(rows):
-            delay = -i * (cols // rows)
-            row = np.roll(interleaved[i], delay)
-            deinterleaved.append(row)
+        matrix = _roll_rows(interleaved, -1)
         
         # Flatten
-        matrix = np.array(deinterleaved)
         result = matrix.T.flatten()
         return result[:n]
\ No newline at end of file
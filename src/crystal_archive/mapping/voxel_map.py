@@ -5,6 +5,88 @@ from typing import Tuple, Dict, Any, List
 from enum import Enum
 
 
+# Fixed-point scales for quantized voxel measurements: angles in
+# centidegrees, retardances in units of 1e-4 wavelengths. The retardance
+# scale folds in voxels_to_symbols' 100x retardance weight, so distances
+# in both axes share the centidegree unit and stay within int16.
+ANGLE_SCALE = 100
+RETARDANCE_SCALE = 100 * ANGLE_SCALE
+HALF_TURN_Q = 180 * ANGLE_SCALE
+
+# Distance (in centidegrees) at which a quantized reliability bottoms out
+RELIABILITY_SPAN_Q = 50 * ANGLE_SCALE
+
+
+def _symbol_table_for(mode: str) -> Dict[int, Tuple[float, float]]:
+    """Build mapping from symbols to (angle, retardance) for a mode."""
+    table = {}
+    
+    if mode == "3bit":
+        angles = [0, 45, 90, 135]  # degrees
+        retardances = [0.25, 0.75]  # wavelengths
+        
+        for symbol in range(8):
+            angle_idx = symbol % 4
+            retard_idx = symbol // 4
+            table[symbol] = (angles[angle_idx], retardances[retard_idx])
+    else:  # 5bit
+        angles = [i * 22.5 for i in range(8)]  # 0, 22.5, 45, ..., 157.5
+        retardances = [0.25, 0.5, 0.75, 1.0]
+        
+        for symbol in range(32):
+            angle_idx = symbol % 8
+            retard_idx = symbol // 8
+            table[symbol] = (angles[angle_idx], retardances[retard_idx])
+    
+    return table
+
+
+def _build_lookup_tables(mode: str) -> Tuple[np.ndarray, ...]:
+    """
+    Flatten a mode's symbol table into read-only arrays for the hot paths.
+    
+    Returns:
+        (sym2angle, sym2retard, orientation_angles, retardance_values,
+         pair_to_sym, orientation_angles_q, retardance_values_q, sym2bits)
+    """
+    table = _symbol_table_for(mode)
+    num_symbols = len(table)
+    bits_per_voxel = (num_symbols - 1).bit_length()
+    
+    # Symbol -> voxel properties
+    sym2angle = np.array([table[s][0] for s in range(num_symbols)], dtype=float)
+    sym2retard = np.array([table[s][1] for s in range(num_symbols)], dtype=float)
+    
+    # Distinct levels per axis, and (orientation, retardance) index -> symbol,
+    # so the two axes can be demapped independently
+    orientation_angles = np.unique(sym2angle)
+    retardance_values = np.unique(sym2retard)
+    pair_to_sym = np.zeros((len(orientation_angles), len(retardance_values)), dtype=np.uint8)
+    for symbol in range(num_symbols):
+        orient_idx = np.searchsorted(orientation_angles, sym2angle[symbol])
+        retard_idx = np.searchsorted(retardance_values, sym2retard[symbol])
+        pair_to_sym[orient_idx, retard_idx] = symbol
+    
+    # Quantized levels for the integer soft demapper
+    orientation_angles_q = np.round(orientation_angles * ANGLE_SCALE).astype(np.int16)
+    retardance_values_q = np.round(retardance_values * RETARDANCE_SCALE).astype(np.int16)
+    
+    # Bits of every byte value, MSB first, keeping the low bits_per_voxel;
+    # covering all 256 values matches unpackbits on out-of-range symbols
+    all_bytes = np.arange(256, dtype=np.uint8)[:, None]
+    sym2bits = np.ascontiguousarray(np.unpackbits(all_bytes, axis=1)[:, 8 - bits_per_voxel:])
+    
+    tables = (sym2angle, sym2retard, orientation_angles, retardance_values,
+              pair_to_sym, orientation_angles_q, retardance_values_q, sym2bits)
+    for array in tables:
+        array.flags.writeable = False
+    return tables
+
+
+# Lookup tables depend only on the mode, so build them once at import
+_TABLES = {mode: _build_lookup_tables(mode) for mode in ("3bit", "5bit")}
+
+
 class VoxelMode(Enum):
     """Voxel encoding modes."""
     MODE_3BIT = "3bit"
@@ -37,6 +119,12 @@ class VoxelMapper:
         
         self.gray_codes = self._generate_gray_codes()
         self.symbol_table = self._build_symbol_table()
+        
+        # Flat lookup tables for the hot paths, shared by all mappers of a
+        # mode; symbol_table is kept for serialization only
+        (self._sym2angle, self._sym2retard,
+         self._orientation_angles, self._retardance_values, self._pair_to_sym,
+         self._orientation_angles_q, self._retardance_values_q, self._sym2bits) = _TABLES[mode]
     
     def _generate_gray_codes(self) -> Dict[int, int]:
         """Generate Gray code mappings."""
@@ -62,26 +150,7 @@ class VoxelMapper:
     
     def _build_symbol_table(self) -> Dict[int, Tuple[float, float]]:
         """Build mapping from symbols to (angle, retardance)."""
-        table = {}
-        
-        if self.mode == "3bit":
-            angles = [0, 45, 90, 135]  # degrees
-            retardances = [0.25, 0.75]  # wavelengths
-            
-            for symbol in range(8):
-                angle_idx = symbol % 4
-                retard_idx = symbol // 4
-                table[symbol] = (angles[angle_idx], retardances[retard_idx])
-        else:  # 5bit
-            angles = [i * 22.5 for i in range(8)]  # 0, 22.5, 45, ..., 157.5
-            retardances = [0.25, 0.5, 0.75, 1.0]
-            
-            for symbol in range(32):
-                angle_idx = symbol % 8
-                retard_idx = symbol // 8
-                table[symbol] = (angles[angle_idx], retardances[retard_idx])
-        
-        return table
+        return _symbol_table_for(self.mode)
     
     def bits_to_symbols(self, bits: np.ndarray) -> np.ndarray:
         """Convert bit array to symbol array."""
@@ -90,41 +159,24 @@ class VoxelMapper:
         if padding:
             bits = np.pad(bits, (0, padding))
         
-        symbols = []
-        for i in range(0, len(bits), self.bits_per_voxel):
-            chunk = bits[i:i+self.bits_per_voxel]
-            # Convert to integer
-            symbol = 0
-            for j, bit in enumerate(chunk):
-                symbol |= (bit << (self.bits_per_voxel - 1 - j))
-            symbols.append(symbol)
-        
-        return np.array(symbols, dtype=np.uint8)
+        # Pack each group of bits MSB first; packbits pads the low end of
+        # the byte, so shift the unused bits back out
+        groups = np.asarray(bits, dtype=np.uint8).reshape(-1, self.bits_per_voxel)
+        return np.packbits(groups, axis=1)[:, 0] >> (8 - self.bits_per_voxel)
     
     def symbols_to_bits(self, symbols: np.ndarray) -> np.ndarray:
         """Convert symbol array back to bits."""
-        bits = []
-        for symbol in symbols:
-            # Convert to bits
-            for i in range(self.bits_per_voxel):
-                bit = (symbol >> (self.bits_per_voxel - 1 - i)) & 1
-                bits.append(bit)
-        
-        return np.array(bits, dtype=np.uint8)
+        # One table row per symbol: its low bits_per_voxel bits, MSB first
+        symbols = np.asarray(symbols, dtype=np.uint8)
+        return np.take(self._sym2bits, symbols, axis=0).ravel()
     
     def symbols_to_voxels(self, symbols: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """Convert symbols to voxel properties (angles, retardances)."""
-        angles = np.zeros(len(symbols), dtype=float)
-        retardances = np.zeros(len(symbols), dtype=float)
+        # Default to first symbol if out of range
+        symbols = np.asarray(symbols)
+        symbols = np.where((symbols >= 0) & (symbols < self.num_symbols), symbols, 0)
         
-        for i, symbol in enumerate(symbols):
-            if symbol in self.symbol_table:
-                angles[i], retardances[i] = self.symbol_table[symbol]
-            else:
-                # Default to first symbol if out of range
-                angles[i], retardances[i] = self.symbol_table[0]
-        
-        return angles, retardances
+        return self._sym2angle[symbols], self._sym2retard[symbols]
     
     def voxels_to_symbols(
         self,
@@ -143,32 +195,83 @@ class VoxelMapper:
         Returns:
             (symbols, reliabilities)
         """
-        symbols = np.zeros(len(angles), dtype=np.uint8)
+        angles = np.asarray(angles, dtype=float)
+        retardances = np.asarray(retardances, dtype=float)
+        
+        # The distance is separable, so find the closest orientation and
+        # retardance level independently
+        # Angular distance (wrap around)
+        angle_diff = np.abs(angles[:, None] - self._orientation_angles[None, :])
+        angle_diff = np.minimum(angle_diff, np.abs(angle_diff - 180))
+        retard_diff = np.abs(retardances[:, None] - self._retardance_values[None, :])
+        
+        angle_idx = np.argmin(angle_diff, axis=1)
+        retard_idx = np.argmin(retard_diff, axis=1)
+        symbols = self._pair_to_sym[angle_idx, retard_idx]
         reliabilities = np.ones(len(angles), dtype=float)
         
-        for i, (angle, retard) in enumerate(zip(angles, retardances)):
-            # Find closest symbol
-            best_symbol = 0
-            best_distance = float('inf')
-            
-            for symbol, (ref_angle, ref_retard) in self.symbol_table.items():
-                # Angular distance (wrap around)
-                angle_diff = min(abs(angle - ref_angle), 
-                               abs(angle - ref_angle + 180),
-                               abs(angle - ref_angle - 180))
-                retard_diff = abs(retard - ref_retard)
-                
-                # Combined distance
-                distance = angle_diff + retard_diff * 100  # Weight retardance more
-                
-                if distance < best_distance:
-                    best_distance = distance
-                    best_symbol = symbol
-            
-            symbols[i] = best_symbol
+        if soft_output:
+            # Simple reliability based on distance
+            rows = np.arange(len(angles))
+            # Combined distance (weight retardance more)
+            best_distance = angle_diff[rows, angle_idx] + retard_diff[rows, retard_idx] * 100
+            reliabilities = np.maximum(0.1, 1.0 - best_distance / 50.0)
+        
+        return symbols, reliabilities
+    
+    def quantize_voxels(
+        self,
+        angles: np.ndarray,
+        retardances: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Quantize voxel measurements to the int16 fixed point used by voxels_to_symbols_int16."""
+        angles_q = np.round(np.asarray(angles) * ANGLE_SCALE)
+        retardances_q = np.round(np.asarray(retardances) * RETARDANCE_SCALE)
+        limit = np.iinfo(np.int16)
+        return (
+            np.clip(angles_q, limit.min, limit.max).astype(np.int16),
+            np.clip(retardances_q, limit.min, limit.max).astype(np.int16)
+        )
+    
+    def voxels_to_symbols_int16(
+        self,
+        angles_q: np.ndarray,
+        retardances_q: np.ndarray,
+        soft_output: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Integer version of voxels_to_symbols for quantized measurements.
+        
+        Distances to every orientation and retardance level are computed at
+        once in integer arithmetic and the nearest level is taken per axis,
+        with the same metric and tie-breaking as voxels_to_symbols.
+        
+        Args:
+            angles_q: Orientation angles in centidegrees (int16)
+            retardances_q: Retardances in 1e-4 wavelengths (int16)
+            soft_output: Return reliability information
             
-            if soft_output:
-                # Simple reliability based on distance
-                reliabilities[i] = max(0.1, 1.0 - best_distance / 50.0)
+        Returns:
+            (symbols, reliabilities) with reliabilities as int8 in 0..127
+        """
+        angles_q = np.asarray(angles_q, dtype=np.int16)
+        retardances_q = np.asarray(retardances_q, dtype=np.int16)
+        
+        # Angular distance (wrap around), computed in int32 to avoid overflow
+        angle_diff = np.abs(angles_q[:, None].astype(np.int32) - self._orientation_angles_q[None, :])
+        angle_diff = np.minimum(angle_diff, np.abs(angle_diff - HALF_TURN_Q))
+        retard_diff = np.abs(retardances_q[:, None].astype(np.int32) - self._retardance_values_q[None, :])
+        
+        angle_idx = np.argmin(angle_diff, axis=1)
+        retard_idx = np.argmin(retard_diff, axis=1)
+        symbols = self._pair_to_sym[angle_idx, retard_idx]
+        reliabilities = np.full(len(angles_q), 127, dtype=np.int8)
+        
+        if soft_output:
+            # Simple reliability based on distance, floored at 0.1
+            rows = np.arange(len(angles_q))
+            best_distance = angle_diff[rows, angle_idx] + retard_diff[rows, retard_idx]
+            scaled = 127 - best_distance * 127 // RELIABILITY_SPAN_Q
+            reliabilities = np.clip(scaled, 13, 127).astype(np.int8)
         
-        return symbols, reliabilities
\ No newline at end of file
+        return symbols, reliabilities
@@ -2,20 +2,92 @@
 
 import os
 import json
-import hashlib
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256 as _sha256
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, Iterator, List, Tuple, Any
+
+
+# Read size for streaming file contents (1 MiB stays cache-friendly)
+READ_CHUNK_SIZE = 1 << 20
+
+# Files read concurrently while packing
+READ_WORKERS = 4
+
+MAGIC = b"CRYSTAL\x00"
+FILE_MARKER = b"FILE\x00"
+
+# Big-endian 64-bit file size field
+_SIZE = struct.Struct(">Q")
 
 
 def sha256(data: bytes) -> str:
     """Compute SHA-256 hash of bytes."""
-    return hashlib.sha256(data).hexdigest()
+    return _sha256(data).hexdigest()
 
 
-def pack_folder_to_bytes(folder: Path) -> Tuple[bytes, Dict[str, Any]]:
+def _read_into(filepath: str, dest: memoryview) -> Tuple[int, str]:
+    """
+    Read a file into dest, hashing each chunk as it arrives so the hash and
+    the blob share a single pass over the file.
+    
+    Returns:
+        (bytes_read, sha256_hex)
+    """
+    file_hash = _sha256()
+    n_read = 0
+    # Views are released on exit, even on error, so the blob can be resized
+    with dest, open(filepath, "rb") as f:
+        while n_read < len(dest):
+            with dest[n_read:n_read + READ_CHUNK_SIZE] as chunk:
+                n = f.readinto(chunk)
+                if not n:
+                    break
+                with chunk[:n] as filled:
+                    file_hash.update(filled)
+            n_read += n
+    return n_read, file_hash.hexdigest()
+
+
+def _iter_files(root: str) -> Iterator[os.DirEntry]:
+    """
+    Walk a directory tree with os.scandir, yielding file entries.
+    
+    Matches os.walk order: each directory's files sorted by name, then its
+    subdirectories in listing order. Symlinked directories are not followed.
+    """
+    stack = [root]
+    while stack:
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        files.append(entry)
+                    elif not entry.is_symlink():
+                        subdirs.append(entry.path)
+        except OSError:
+            continue
+        
+        files.sort(key=lambda entry: entry.name)
+        yield from files
+        stack.extend(reversed(subdirs))
+
+
+def pack_folder_to_bytes(folder: Path) -> Tuple[bytearray, Dict[str, Any]]:
     """
     Pack a folder into a single binary blob with metadata.
     
+    The blob is allocated once up front and each file is read straight into
+    its slot, so file contents are never copied through intermediate bytes.
+    Files are read concurrently and then laid out in walk order.
+    
     Returns:
         (blob, metadata) where metadata contains file information
     """
@@ -23,42 +95,74 @@ def pack_folder_to_bytes(folder: Path) -> Tuple[bytes, Dict[str, Any]]:
         raise ValueError(f"Folder {folder} does not exist")
     
     metadata = {"files": [], "total_size": 0}
-    parts = []
+    
+    # Collect all files and size the blob
+    entries = []
+    total = len(MAGIC)
+    root = str(folder)
+    prefix_len = len(os.path.join(root, ""))
+    for entry in _iter_files(root):
+        filepath = entry.path
+        relative_path = filepath[prefix_len:]
+        try:
+            size = entry.stat().st_size
+        except OSError as e:
+            print(f"Warning: Could not read {filepath}: {e}")
+            continue
+        
+        path_bytes = relative_path.encode("utf-8")
+        entries.append((filepath, relative_path, path_bytes, size))
+        total += len(FILE_MARKER) + len(path_bytes) + 1 + _SIZE.size + size
+    
+    blob = bytearray(total)
+    view = memoryview(blob)
     
     # Header magic
-    parts.append(b"CRYSTAL\x00")
+    view[:len(MAGIC)] = MAGIC
+    
+    # Read every file into its reserved slot on a small thread pool so disk
+    # reads overlap with hashing (hashlib and file reads release the GIL)
+    slots = []
+    slot_start = len(MAGIC)
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+        for filepath, relative_path, path_bytes, size in entries:
+            data_start = slot_start + len(FILE_MARKER) + len(path_bytes) + 1 + _SIZE.size
+            future = pool.submit(_read_into, filepath, view[data_start:data_start + size])
+            slots.append((future, data_start))
+            slot_start = data_start + size
     
-    # Collect all files
-    for root, _, files in os.walk(folder):
-        for filename in sorted(files):
-            filepath = Path(root) / filename
-            relative_path = str(filepath.relative_to(folder))
-            
-            # Read file content
-            try:
-                data = filepath.read_bytes()
-            except Exception as e:
-                print(f"Warning: Could not read {filepath}: {e}")
-                continue
-            
-            # Store metadata
-            file_info = {
-                "path": relative_path,
-                "size": len(data),
-                "sha256": sha256(data)
-            }
-            metadata["files"].append(file_info)
-            metadata["total_size"] += len(data)
-            
-            # Pack: FILE marker + path + size + data
-            parts.append(b"FILE\x00")
-            parts.append(relative_path.encode("utf-8"))
-            parts.append(b"\x00")
-            parts.append(len(data).to_bytes(8, "big"))
-            parts.append(data)
+    pos = len(MAGIC)
+    for (filepath, relative_path, path_bytes, size), (future, data_start) in zip(entries, slots):
+        try:
+            n_read, digest = future.result()
+        except Exception as e:
+            print(f"Warning: Could not read {filepath}: {e}")
+            continue
+        
+        # Store metadata (a file that shrank since it was sized is stored as read)
+        file_info = {
+            "path": relative_path,
+            "size": n_read,
+            "sha256": digest
+        }
+        metadata["files"].append(file_info)
+        metadata["total_size"] += n_read
+        
+        # Pack: FILE marker + path + size + data
+        header = FILE_MARKER + path_bytes + b"\x00"
+        view[pos:pos + len(header)] = header
+        pos += len(header)
+        _SIZE.pack_into(view, pos, n_read)
+        pos += _SIZE.size
+        
+        # Close up space left by earlier files that failed or shrank
+        if pos != data_start:
+            view[pos:pos + n_read] = view[data_start:data_start + n_read]
+        pos += n_read
     
-    # Combine all parts
-    blob = b"".join(parts)
+    # Drop space reserved for files that could not be read in full
+    view.release()
+    del blob[pos:]
     return blob, metadata
 
 
@@ -69,16 +173,18 @@ def unpack_bytes_to_folder(blob: bytes, output_dir: Path) -> Dict[str, Any]:
     Returns:
         metadata dict with file information
     """
-    if not blob.startswith(b"CRYSTAL\x00"):
+    if not blob.startswith(MAGIC):
         raise ValueError("Invalid archive format")
     
     output_dir.mkdir(parents=True, exist_ok=True)
     metadata = {"files": [], "total_size": 0}
     
+    # Parse through a memoryview so file contents are never copied out of the blob
+    view = memoryview(blob)
     pos = 8  # Skip CRYSTAL magic
     while pos < len(blob):
         # Check for FILE marker
-        if pos + 5 > len(blob) or blob[pos:pos+5] != b"FILE\x00":
+        if not blob.startswith(FILE_MARKER, pos):
             break
         pos += 5
         
@@ -86,25 +192,26 @@ def unpack_bytes_to_folder(blob: bytes, output_dir: Path) -> Dict[str, Any]:
         name_end = blob.find(b"\x00", pos)
         if name_end == -1:
             break
-        filename = blob[pos:name_end].decode("utf-8")
+        filename = str(view[pos:name_end], "utf-8")
         pos = name_end + 1
         
         # Read size
-        if pos + 8 > len(blob):
+        if pos + _SIZE.size > len(blob):
             break
-        size = int.from_bytes(blob[pos:pos+8], "big")
-        pos += 8
+        (size,) = _SIZE.unpack_from(view, pos)
+        pos += _SIZE.size
         
         # Read data
         if pos + size > len(blob):
             break
-        data = blob[pos:pos+size]
+        data = view[pos:pos+size]
         pos += size
         
         # Write file
         output_path = output_dir / filename
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_bytes(data)
+        with open(output_path, "wb") as f:
+            f.write(data)
         
         # Update metadata
         metadata["files"].append({
@@ -23,9 +23,12 @@ class DamageModel:
     
     def apply_bitflips(self, data: np.ndarray, p: float) -> np.ndarray:
         """Apply random bit flips with probability p."""
-        flips = self.rng.random(len(data)) < p
+        # The flip count is binomial; drawing only the flipped positions
+        # avoids a full-size float mask at the low error rates simulated
         damaged = data.copy()
-        damaged[flips] ^= 1
+        n_flips = self.rng.binomial(data.size, p)
+        positions = self.rng.choice(data.size, n_flips, replace=False)
+        damaged.reshape(-1)[positions] ^= 1
         return damaged
     
     def apply_tile_loss(
@@ -40,23 +43,38 @@ class DamageModel:
         Returns:
             (damaged_data, erasure_mask)
         """
-        n_tiles = (len(data) + tile_size - 1) // tile_size
+        damaged, erasure_mask = self.apply_tile_loss_batch(
+            data[np.newaxis, :], tile_size, loss_fraction
+        )
+        return damaged[0], erasure_mask[0]
+    
+    def apply_tile_loss_batch(
+        self,
+        data: np.ndarray,
+        tile_size: int,
+        loss_fraction: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply tile losses independently to each row of a (n_trials, n) batch.
+        
+        Returns:
+            (damaged_data, erasure_mask)
+        """
+        n_trials, n = data.shape
+        n_tiles = (n + tile_size - 1) // tile_size
         n_lost = int(n_tiles * loss_fraction)
         
-        # Select tiles to lose
-        lost_tiles = self.rng.choice(n_tiles, n_lost, replace=False)
+        # Ranking random keys picks n_lost distinct tiles per trial
+        lost_tiles = self.rng.random((n_trials, n_tiles)).argsort(axis=1)[:, :n_lost]
+        lost = np.zeros((n_trials, n_tiles), dtype=bool)
+        np.put_along_axis(lost, lost_tiles, True, axis=1)
+        lost = np.repeat(lost, tile_size, axis=1)[:, :n]
         
+        # Corrupt with random data
         damaged = data.copy()
-        erasure_mask = np.ones(len(data), dtype=bool)
-        
-        for tile_idx in lost_tiles:
-            start = tile_idx * tile_size
-            end = min(start + tile_size, len(data))
-            # Corrupt with random data
-            damaged[start:end] = self.rng.integers(0, 2, end - start, dtype=data.dtype)
-            erasure_mask[start:end] = False
+        damaged[lost] = self.rng.integers(0, 2, np.count_nonzero(lost), dtype=data.dtype)
         
-        return damaged, erasure_mask
+        return damaged, ~lost
     
     def apply_calibration_drift(
         self,
@@ -135,22 +153,45 @@ class ChannelSimulator:
         Returns:
             (damaged_data, damage_stats)
         """
-        damaged = data.copy()
+        # Run as a one-row batch so tile loss goes through the vectorized kernel
+        damaged, stats = self.simulate_batch(
+            data[np.newaxis, :], tile_loss=tile_loss, bitflip_p=bitflip_p
+        )
+        damaged = damaged[0]
+        if "tiles_lost" in stats:
+            stats["tiles_lost"] = int(stats["tiles_lost"][0])
+        
+        stats["angle_drift"] = angle_drift
+        stats["angle_noise_sigma"] = angle_noise
+        
+        return damaged, stats
+    
+    def simulate_batch(
+        self,
+        data: np.ndarray,
+        tile_loss: float = 0.0,
+        bitflip_p: float = 0.0
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Apply damage independently to each row of a (n_trials, n) batch.
+        
+        Vectorized equivalent of calling simulate() once per trial.
+        
+        Returns:
+            (damaged_data, damage_stats)
+        """
+        damaged = np.array(data, copy=True)
         stats = {}
         
-        # Apply tile losses first
         if tile_loss > 0:
-            damaged, erasure_mask = self.damage_model.apply_tile_loss(
+            damaged, erasure_mask = self.damage_model.apply_tile_loss_batch(
                 damaged, tile_size=256, loss_fraction=tile_loss
             )
-            stats["tiles_lost"] = np.sum(~erasure_mask) // 256
+            lost = damaged.shape[1] - np.count_nonzero(erasure_mask, axis=1)
+            stats["tiles_lost"] = lost // 256
         
-        # Apply random bit flips
         if bitflip_p > 0:
             damaged = self.damage_model.apply_bitflips(damaged, bitflip_p)
-            stats["expected_bitflips"] = int(len(data) * bitflip_p)
-        
-        stats["angle_drift"] = angle_drift
-        stats["angle_noise_sigma"] = angle_noise
+            stats["expected_bitflips"] = int(damaged.shape[1] * bitflip_p)
         
         return damaged, stats
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""Tests for the channel damage models."""
+
+import numpy as np
+import pytest
+
+from crystal_archive.simulate.channel import ChannelSimulator, DamageModel
+
+
+@pytest.mark.parametrize("n", [256 * 40, 256 * 40 + 100])
+def test_simulate_batch_loses_whole_tiles_per_trial(n):
+    simulator = ChannelSimulator(seed=3)
+    data = np.zeros((16, n), dtype=np.uint8)
+
+    damaged, _ = simulator.simulate_batch(data, tile_loss=0.25)
+
+    n_tiles = -(-n // 256)
+    n_lost = int(n_tiles * 0.25)
+    assert damaged.shape == data.shape
+    assert not data.any()
+
+    # Corruption fills exactly n_lost whole tiles, chosen per trial
+    padded = np.pad(damaged, ((0, 0), (0, n_tiles * 256 - n)))
+    touched = padded.reshape(16, n_tiles, 256).any(axis=2)
+    assert (touched.sum(axis=1) == n_lost).all()
+    assert len({row.tobytes() for row in touched}) > 1
+
+
+def test_simulate_matches_one_row_batch():
+    data = np.random.default_rng(0).integers(0, 2, 256 * 10, dtype=np.uint8)
+
+    damaged, stats = ChannelSimulator(seed=5).simulate(data, tile_loss=0.3, bitflip_p=0.01)
+    batch, batch_stats = ChannelSimulator(seed=5).simulate_batch(
+        data[np.newaxis, :], tile_loss=0.3, bitflip_p=0.01
+    )
+
+    np.testing.assert_array_equal(damaged, batch[0])
+    assert stats["tiles_lost"] == 3 and isinstance(stats["tiles_lost"], int)
+    assert stats["expected_bitflips"] == batch_stats["expected_bitflips"]
+
+
+@pytest.mark.parametrize("p", [0.0, 1e-3, 0.05, 1.0])
+def test_bitflips_flip_distinct_positions_at_rate_p(p):
+    model = DamageModel(seed=9)
+    data = np.random.default_rng(1).integers(0, 2, (20, 10_000), dtype=np.uint8)
+
+    damaged = model.apply_bitflips(data, p)
+
+    flipped = np.count_nonzero(damaged != data)
+    assert damaged.shape == data.shape
+    assert ((damaged ^ data) <= 1).all()
+    # Binomial count: within 5 standard deviations of the mean
+    assert abs(flipped - data.size * p) <= 5 * np.sqrt(data.size * p * (1 - p))
@@ -0,0 +1,136 @@
+"""End-to-end tests for the crystal-archive command-line tool."""
+
+import numpy as np
+import pytest
+
+import cli
+
+
+@pytest.fixture
+def archive_cli(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    return cli.CrystalArchiveCLI()
+
+
+@pytest.fixture
+def source(tmp_path):
+    folder = tmp_path / "source"
+    (folder / "sub").mkdir(parents=True)
+    random_bytes = np.random.default_rng(0).integers(0, 256, 40_000, dtype=np.uint8).tobytes()
+    (folder / "random.bin").write_bytes(random_bytes)
+    (folder / "sub" / "copy.bin").write_bytes(random_bytes)
+    (folder / "notes.txt").write_text("crystal archive\n" * 5000)
+    (folder / "empty").write_bytes(b"")
+    # Over the 1 MiB threshold, so encode memory-maps it
+    (folder / "sub" / "zeros.bin").write_bytes(bytes(2 << 20))
+    return folder
+
+
+def _tree(folder):
+    return {str(p.relative_to(folder)): p.read_bytes() for p in folder.rglob("*") if p.is_file()}
+
+
+def _corrupt_payload(archive, span, positions):
+    """Flip the low bit of the voxel symbols at the given positions of a payload."""
+    data = bytearray(archive.read_bytes())
+    offset, _ = span
+    for pos in positions:
+        data[offset + pos] ^= 1
+    archive.write_bytes(bytes(data))
+
+
+@pytest.mark.parametrize("profile, compression, error_correction", [
+    ("A", True, True),
+    ("B", True, True),
+    ("B", False, False),
+])
+def test_encode_decode_verify_round_trip(tmp_path, archive_cli, source, profile, compression,
+                                         error_correction):
+    archive = tmp_path / "out.crystal"
+
+    manifest = archive_cli.encode(str(source), str(archive), profile, compression,
+                                  error_correction)
+
+    # Identical files share one payload
+    refs = {f["name"]: f["data_ref"] for f in manifest["files"]}
+    assert len(manifest["payloads"]) == 4
+    assert refs["source/random.bin"] == refs["source/sub/copy.bin"]
+
+    result = archive_cli.decode(str(archive), str(tmp_path / "decoded"))
+
+    assert all(f["checksum_valid"] for f in result["files"])
+    assert _tree(tmp_path / "decoded" / "source") == _tree(source)
+
+    report = archive_cli.verify(str(archive), deep_scan=True)
+
+    assert report["healthy"]
+    assert report["errors"] == report["warnings"] == report["deep_errors"] == []
+
+
+def test_reed_solomon_corrects_damaged_payload(tmp_path, archive_cli, source):
+    archive = tmp_path / "out.crystal"
+    manifest = archive_cli.encode(str(source), str(archive))
+    # About one damaged symbol per RS block
+    for span in manifest["payloads"]:
+        _corrupt_payload(archive, span, range(0, span[1], 997))
+
+    result = archive_cli.decode(str(archive), str(tmp_path / "decoded"))
+
+    assert all(f["checksum_valid"] for f in result["files"])
+    assert _tree(tmp_path / "decoded" / "source") == _tree(source)
+    assert archive_cli.verify(str(archive), deep_scan=True)["deep_errors"] == []
+
+
+def test_deep_scan_reports_damage_without_error_correction(tmp_path, archive_cli, source):
+    archive = tmp_path / "out.crystal"
+    manifest = archive_cli.encode(str(source), str(archive), "A", False, False)
+    notes = next(f for f in manifest["files"] if f["name"] == "source/notes.txt")
+    _corrupt_payload(archive, manifest["payloads"][notes["data_ref"]], [10])
+
+    report = archive_cli.verify(str(archive), deep_scan=True)
+
+    assert report["deep_errors"] == ["Checksum mismatch for source/notes.txt"]
+
+
+def test_list_reads_each_archive_once(tmp_path, archive_cli, source, monkeypatch):
+    archive = archive_cli.archives_dir / "first.crystal"
+    manifest = archive_cli.encode(str(source), str(archive))
+    # The manifest lives only in the archive trailer and the index
+    assert sorted(p.name for p in archive_cli.archives_dir.iterdir()) == \
+        ["first.crystal", "index.json"]
+    reads = []
+    read_manifest = archive_cli._read_manifest
+
+    def counting_read_manifest(archive_path):
+        reads.append(archive_path)
+        return read_manifest(archive_path)
+
+    monkeypatch.setattr(archive_cli, "_read_manifest", counting_read_manifest)
+
+    # encode indexed the archive, so listing does not open it
+    assert [a["archive_id"] for a in archive_cli.list_archives()] == [manifest["archive_id"]]
+    assert reads == []
+
+    # An archive replaced behind the index's back fails the stat check
+    other = archive_cli.encode(str(source / "sub"), str(tmp_path / "other.crystal"))
+    archive.write_bytes((tmp_path / "other.crystal").read_bytes())
+
+    assert [a["archive_id"] for a in archive_cli.list_archives()] == [other["archive_id"]]
+    assert reads == [archive]
+    archive_cli.list_archives()
+    assert reads == [archive]
+
+
+def test_encode_one_reuses_the_parent_checksum(source, monkeypatch):
+    def no_hashing(*args):
+        raise AssertionError("worker re-hashed the file")
+
+    monkeypatch.setattr(cli.hashlib, "sha256", no_hashing)
+    file_info, payload = cli._encode_one(
+        source / "notes.txt", "precomputed", mode="3bit", compression=True,
+        error_correction=True, input_parent=source.parent
+    )
+
+    assert file_info["checksum"] == "precomputed"
+    assert file_info["name"] == "source/notes.txt"
+    assert file_info["encoded_size"] == len(payload)
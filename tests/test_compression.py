@@ -0,0 +1,69 @@
+"""Tests for compression codecs."""
+
+import lzma
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+import zstandard as zstd
+
+from crystal_archive.codecs.compression import (
+    ZSTD_THREADED_MIN_SIZE, compress_data, decompress_data
+)
+
+
+def _sample(size):
+    """Half repetitive text, half random bytes."""
+    text = (b"crystal archive sample text " * (size // 28 + 1))[:size // 2]
+    noise = np.random.default_rng(size).integers(0, 256, size - len(text), dtype=np.uint8)
+    return text + noise.tobytes()
+
+
+@pytest.mark.parametrize("codec", ["zstd", "zstd-long", "xz", "none"])
+@pytest.mark.parametrize("size", [0, 1000, 300_000])
+def test_round_trip(codec, size):
+    data = _sample(size)
+
+    compressed, info = compress_data(data, codec=codec, level=3)
+
+    assert decompress_data(compressed, info) == data
+    assert info["codec"] == codec
+    assert info["original_size"] == size
+    assert info["compressed_size"] == len(compressed)
+
+
+def test_xz_is_plain_lzma():
+    data = _sample(300_000)
+
+    compressed, _ = compress_data(data, codec="xz", level=6)
+
+    # Same bytes on every machine, whatever xz tools are installed
+    assert compressed == lzma.compress(data, preset=6)
+
+
+@pytest.mark.parametrize("size, threads", [(1000, 0), (ZSTD_THREADED_MIN_SIZE, -1)])
+def test_zstd_threads_by_input_size(size, threads):
+    data = _sample(size)
+
+    compressed, info = compress_data(data, codec="zstd", level=3)
+
+    assert info["threads"] == threads
+    # Threaded frames still record their content size, so no size hint is needed
+    assert zstd.ZstdDecompressor().decompress(compressed) == data
+
+
+def test_reused_contexts_match_fresh_compressors():
+    inputs = [_sample(size) for size in (1000, 5000, 300_000)]
+    expected = [zstd.ZstdCompressor(level=3).compress(data) for data in inputs[:2]]
+
+    # Each thread compresses every input twice through its cached context
+    def run(_):
+        return [compress_data(data, codec="zstd", level=3)[0] for data in inputs * 2]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(run, range(8)))
+
+    for outputs in results:
+        assert outputs == results[0]
+        assert outputs[:2] == expected
+        assert [decompress_data(c, {"codec": "zstd"}) for c in outputs] == inputs * 2
@@ -0,0 +1,127 @@
+"""Equivalence tests for the vectorized LDPC encoder and decoders."""
+
+import numpy as np
+import pytest
+
+from crystal_archive.codecs.ecc_ldpc import SimpleLDPC
+
+
+@pytest.fixture(scope="module")
+def ldpc():
+    return SimpleLDPC(n=256, k=192)
+
+
+def _noisy_codewords(ldpc, n_frames, flip_p, seed):
+    rng = np.random.default_rng(seed)
+    data = rng.integers(0, 2, (n_frames, ldpc.k), dtype=np.uint8)
+    codewords = ldpc.encode_batch(data)
+    flips = (rng.random(codewords.shape) < flip_p).astype(np.uint8)
+    return data, codewords, codewords ^ flips
+
+
+def test_encode_batch_matches_dense_parity(ldpc):
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 2, (8, ldpc.k), dtype=np.uint8)
+
+    codewords = ldpc.encode_batch(data)
+
+    # Reference: parity bit k + i is the XOR of the data bits on row i of H
+    expected = np.zeros((len(data), ldpc.n), dtype=np.uint8)
+    expected[:, :ldpc.k] = data
+    parity = (data @ ldpc.H[:, :ldpc.k].T.astype(np.int64)) % 2
+    checks = np.flatnonzero(ldpc.H[:, :ldpc.k].any(axis=1))
+    expected[:, ldpc.k + checks] = parity[:, checks]
+    np.testing.assert_array_equal(codewords, expected)
+
+    for row, codeword in zip(data, codewords):
+        np.testing.assert_array_equal(ldpc.encode(row), codeword)
+
+
+def test_encode_batch_rejects_wrong_width(ldpc):
+    with pytest.raises(ValueError):
+        ldpc.encode_batch(np.zeros((2, ldpc.k + 1), dtype=np.uint8))
+
+
+def _reference_decode_hard(H, k, received, max_iter):
+    """Dense bit-flipping decoder, recomputing the syndrome every iteration."""
+    codeword = received.copy()
+    for _ in range(max_iter):
+        syndrome = (H @ codeword) % 2
+        if not syndrome.any():
+            return codeword[:k], True
+        unsatisfied = H.T.astype(np.int64) @ syndrome
+        flip_idx = np.argmax(unsatisfied)
+        if unsatisfied[flip_idx] > 0:
+            codeword[flip_idx] ^= 1
+    return codeword[:k], False
+
+
+@pytest.mark.parametrize("flip_p", [0.01, 0.05, 0.5])
+def test_decode_hard_matches_dense_reference(ldpc, flip_p):
+    _, _, received = _noisy_codewords(ldpc, 8, flip_p, seed=5)
+
+    for frame in received:
+        bits, ok = ldpc.decode_hard(frame, max_iter=25)
+        ref_bits, ref_ok = _reference_decode_hard(ldpc.H, ldpc.k, frame, max_iter=25)
+        np.testing.assert_array_equal(bits, ref_bits)
+        assert ok == ref_ok
+
+
+@pytest.mark.parametrize("flip_p", [0.0, 0.01, 0.05])
+def test_decode_hard_batch_matches_single(ldpc, flip_p):
+    _, _, received = _noisy_codewords(ldpc, 24, flip_p, seed=1)
+
+    decoded, success = ldpc.decode_hard_batch(received, max_iter=30)
+
+    for i, frame in enumerate(received):
+        bits, ok = ldpc.decode_hard(frame, max_iter=30)
+        np.testing.assert_array_equal(decoded[i], bits)
+        assert success[i] == ok
+
+
+def test_decode_hard_batch_random_input(ldpc):
+    # Arbitrary words exercise the stall and cycle exits
+    received = np.random.default_rng(2).integers(0, 2, (16, ldpc.n), dtype=np.uint8)
+
+    for max_iter in (1, 2, 7, 50):
+        decoded, success = ldpc.decode_hard_batch(received, max_iter=max_iter)
+        for i, frame in enumerate(received):
+            bits, ok = ldpc.decode_hard(frame, max_iter=max_iter)
+            np.testing.assert_array_equal(decoded[i], bits)
+            assert success[i] == ok
+
+
+@pytest.mark.parametrize("min_sum, quantize_llr", [(True, False), (False, False), (True, True)])
+def test_decode_soft_batch_matches_single(ldpc, min_sum, quantize_llr):
+    rng = np.random.default_rng(3)
+    _, codewords, _ = _noisy_codewords(ldpc, 12, 0.0, seed=3)
+    llrs = (1 - 2 * codewords.astype(np.float32)) * 4 + rng.normal(0, 2, codewords.shape)
+
+    decoded, posterior, success = ldpc.decode_soft_batch(
+        llrs, max_iter=20, min_sum=min_sum, quantize_llr=quantize_llr
+    )
+
+    # Frames leaving the active set must not change any other frame's result
+    for i, frame in enumerate(llrs):
+        bits, L, ok = ldpc.decode_soft(
+            frame, max_iter=20, min_sum=min_sum, quantize_llr=quantize_llr
+        )
+        np.testing.assert_array_equal(decoded[i], bits)
+        np.testing.assert_array_equal(posterior[i], L)
+        assert success[i] == ok
+
+
+def test_quantized_llrs_agree_with_float_on_strong_input(ldpc):
+    _, codewords, _ = _noisy_codewords(ldpc, 8, 0.0, seed=4)
+    llrs = (1 - 2 * codewords.astype(np.float32)) * 6
+
+    float_bits, _, _ = ldpc.decode_soft_batch(llrs, max_iter=1, quantize_llr=False)
+    quant_bits, quant_L, _ = ldpc.decode_soft_batch(llrs, max_iter=1, quantize_llr=True)
+
+    np.testing.assert_array_equal(quant_bits, float_bits)
+    assert quant_L.dtype == np.float32
+
+
+def test_quantize_llr_requires_min_sum(ldpc):
+    with pytest.raises(ValueError):
+        ldpc.decode_soft_batch(np.zeros((1, ldpc.n)), quantize_llr=True, min_sum=False)
@@ -0,0 +1,50 @@
+"""Tests for the Reed-Solomon codec and sharding."""
+
+import numpy as np
+import pytest
+import reedsolo
+
+from crystal_archive.codecs.ecc_rs import ReedSolomonCodec
+
+
+@pytest.mark.parametrize("length", [0, 1, 222, 223, 224, 5000])
+def test_encode_matches_reedsolo(length):
+    codec = ReedSolomonCodec()
+    data = np.random.default_rng(length).integers(0, 256, length, dtype=np.uint8).tobytes()
+
+    encoded = codec.encode(data)
+
+    # Reference: reedsolo on each zero-padded k-byte chunk
+    reference = reedsolo.RSCodec(codec.nsym)
+    padded = data + bytes(-len(data) % codec.k)
+    expected = b"".join(
+        bytes(reference.encode(padded[i:i + codec.k])) for i in range(0, len(padded), codec.k)
+    )
+    assert encoded == expected
+
+
+def test_decode_corrects_errors():
+    codec = ReedSolomonCodec()
+    data = bytes(range(223))
+    encoded = bytearray(codec.encode(data))
+    for pos in (0, 50, 100, 240):
+        encoded[pos] ^= 0xFF
+
+    assert codec.decode(bytes(encoded)) == data
+
+
+@pytest.mark.parametrize("length", [1, 4096, 10000])
+def test_shard_matrix_layout(length):
+    codec = ReedSolomonCodec()
+    data = np.random.default_rng(length).integers(0, 256, length, dtype=np.uint8).tobytes()
+
+    shards = codec.create_shard_matrix(memoryview(data), shard_size=4096)
+
+    n_data = -(-length // 4096)
+    n_parity = int(n_data * (codec.n / codec.k - 1))
+    assert shards.shape == (n_data + n_parity, 4096)
+    assert shards[:n_data].tobytes()[:length] == data
+    assert not shards[:n_data].reshape(-1)[length:].any()
+    parity = np.bitwise_xor.reduce(shards[:n_data], axis=0)
+    assert all((row == parity).all() for row in shards[n_data:])
+    assert codec.create_shards(data, shard_size=4096) == [row.tobytes() for row in shards]
@@ -0,0 +1,73 @@
+"""Tests for the Merkle tree."""
+
+import hashlib
+import os
+
+import numpy as np
+import pytest
+
+from crystal_archive.codecs.hashing import MerkleTree
+
+
+def _reference_levels(leaves, fanout):
+    """Merkle levels as lists of digests, built one group at a time."""
+    level = [hashlib.sha256(leaf).digest() for leaf in leaves]
+    levels = [level]
+    while len(level) > 1:
+        level = [
+            hashlib.sha256(b"".join(level[i:i + fanout])).digest()
+            for i in range(0, len(level), fanout)
+        ]
+        levels.append(level)
+    return levels
+
+
+def _reference_proof(levels, index, fanout):
+    proof = []
+    for level in levels[:-1]:
+        group_start = index // fanout * fanout
+        for i in range(group_start, min(group_start + fanout, len(level))):
+            if i != index:
+                proof.append(level[i].hex())
+        index //= fanout
+    return proof
+
+
+# 200 x 4 KiB leaves take the thread-pool path; the others hash serially
+@pytest.mark.parametrize("n_leaves, leaf_size", [(1, 10), (2, 10), (7, 64), (65, 64), (200, 4096)])
+@pytest.mark.parametrize("fanout", [2, 3, 4])
+def test_root_and_proofs_match_reference(n_leaves, leaf_size, fanout):
+    leaves = [os.urandom(leaf_size) for _ in range(n_leaves)]
+    levels = _reference_levels(leaves, fanout)
+
+    tree = MerkleTree(leaves, fanout=fanout)
+
+    assert tree.get_root() == levels[-1][0].hex()
+    for index in range(n_leaves):
+        proof = tree.get_proof(index)
+        assert proof == _reference_proof(levels, index, fanout)
+        assert tree.verify_proof(leaves[index], index, proof)
+
+
+def test_tampered_leaf_fails_verification():
+    leaves = [bytes([i]) * 100 for i in range(9)]
+    tree = MerkleTree(leaves)
+
+    assert not tree.verify_proof(b"x" * 100, 4, tree.get_proof(4))
+
+
+def test_bytes_like_leaves():
+    shards = np.random.default_rng(0).integers(0, 256, (70, 4096), dtype=np.uint8)
+
+    from_rows = MerkleTree(list(shards))
+    from_bytes = MerkleTree([row.tobytes() for row in shards])
+
+    assert from_rows.get_root() == from_bytes.get_root()
+
+
+def test_empty_tree():
+    tree = MerkleTree([])
+
+    assert tree.get_root() == ""
+    with pytest.raises(ValueError):
+        tree.get_proof(0)
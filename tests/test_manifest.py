@@ -0,0 +1,108 @@
+"""Tests for manifest hashing and persistence."""
+
+import hashlib
+import json
+
+import pytest
+
+from crystal_archive.archive import manifest as manifest_module
+from crystal_archive.archive.manifest import Manifest
+
+
+def _sample_manifest():
+    manifest = Manifest()
+    manifest.set_profile("A", {"compression_level": 3, "rs_overhead": 0.1})
+    # Floats that orjson and json format differently
+    manifest.set_compression("zstd", {"ratio": 3e-5, "original_size": 1e16, "note": "façade"})
+    manifest.add_file("docs/readme.txt", 120, "ab" * 32)
+    manifest.set_merkle_root("cd" * 32)
+    return manifest
+
+
+# orjson as imported by the manifest module, or None when it is not installed
+ORJSON = manifest_module.orjson
+
+
+def _use_serializer(monkeypatch, name):
+    if name == "json":
+        monkeypatch.setattr(manifest_module, "orjson", None)
+    elif ORJSON is None:
+        pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(manifest_module, "orjson", ORJSON)
+
+
+@pytest.mark.parametrize("serializer", ["orjson", "json"])
+def test_hash_is_canonical_json(monkeypatch, serializer):
+    _use_serializer(monkeypatch, serializer)
+    manifest = _sample_manifest()
+    # Non-string keys sort numerically, which orjson's OPT_SORT_KEYS does not do
+    manifest.data["encoding"]["voxel"] = {"gray_codes": {10: 15, 2: 3}}
+
+    hashed = {key: value for key, value in manifest.data.items() if key != "integrity"}
+    expected = json.dumps(hashed, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+    assert manifest.compute_hash() == hashlib.sha256(expected.encode()).hexdigest()
+
+
+def test_hash_does_not_depend_on_orjson(monkeypatch):
+    manifest = _sample_manifest()
+    _use_serializer(monkeypatch, "orjson")
+    with_orjson = manifest.compute_hash()
+
+    _use_serializer(monkeypatch, "json")
+
+    assert manifest.compute_hash() == with_orjson
+
+
+def test_chunks_join_to_the_whole_document():
+    manifest = _sample_manifest()
+    for i in range(500):
+        manifest.add_file(f"data/part_{i:04d}.bin", i, f"{i:064x}")
+    before = json.dumps(manifest.data, sort_keys=True)
+
+    document = b"".join(manifest._canonical_chunks())
+
+    hashed = {key: value for key, value in manifest.data.items() if key != "integrity"}
+    assert json.loads(document) == hashed
+    assert document == json.dumps(
+        hashed, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+    # Hashing must not touch the manifest, including the integrity block
+    assert json.dumps(manifest.data, sort_keys=True) == before
+
+
+@pytest.mark.parametrize("writer", ["orjson", "json"])
+@pytest.mark.parametrize("reader", ["orjson", "json"])
+def test_save_load_round_trip(tmp_path, monkeypatch, writer, reader):
+    _use_serializer(monkeypatch, writer)
+    manifest = _sample_manifest()
+    path = tmp_path / "manifest.json"
+    manifest.save(path)
+
+    # Archives written with one serializer must load with the other
+    _use_serializer(monkeypatch, reader)
+    loaded = Manifest.load(path)
+
+    assert loaded.data == manifest.data
+    assert loaded.data["integrity"]["manifest_hash"] == manifest.compute_hash()
+
+
+def test_load_accepts_legacy_hash(tmp_path):
+    manifest = _sample_manifest()
+    manifest.data["integrity"]["manifest_hash"] = manifest._legacy_hash()
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(manifest.data, indent=2))
+
+    assert Manifest.load(path).data == manifest.data
+
+
+def test_load_rejects_tampered_manifest(tmp_path):
+    path = tmp_path / "manifest.json"
+    _sample_manifest().save(path)
+    data = json.loads(path.read_text())
+    data["files"][0]["size"] += 1
+    path.write_text(json.dumps(data))
+
+    with pytest.raises(ValueError, match="integrity"):
+        Manifest.load(path)
@@ -0,0 +1,104 @@
+"""Tests for packing folders into blobs."""
+
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from crystal_archive import packer
+from crystal_archive.packer import pack_folder_to_bytes, unpack_bytes_to_folder
+
+
+def _reference_pack(folder):
+    """Blob and metadata as built by concatenating parts in os.walk order."""
+    metadata = {"files": [], "total_size": 0}
+    parts = [b"CRYSTAL\x00"]
+    for root, _, files in os.walk(folder):
+        for filename in sorted(files):
+            filepath = Path(root) / filename
+            data = filepath.read_bytes()
+            relative_path = str(filepath.relative_to(folder))
+            metadata["files"].append({
+                "path": relative_path,
+                "size": len(data),
+                "sha256": hashlib.sha256(data).hexdigest()
+            })
+            metadata["total_size"] += len(data)
+            parts += [b"FILE\x00", relative_path.encode("utf-8"), b"\x00",
+                      len(data).to_bytes(8, "big"), data]
+    return b"".join(parts), metadata
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / "source"
+    (folder / "b" / "deep").mkdir(parents=True)
+    (folder / "a").mkdir()
+    (folder / "z.txt").write_bytes(b"last name, first directory")
+    (folder / "m.bin").write_bytes(os.urandom(3 << 20))
+    (folder / "a" / "empty").write_bytes(b"")
+    (folder / "b" / "deep" / "notes.txt").write_text("tiefe Notizen\n" * 100)
+    return folder
+
+
+def test_pack_matches_reference(folder):
+    blob, metadata = pack_folder_to_bytes(folder)
+    expected_blob, expected_metadata = _reference_pack(folder)
+
+    assert blob == expected_blob
+    assert metadata == expected_metadata
+
+
+def test_unpack_round_trip(folder, tmp_path):
+    blob, metadata = pack_folder_to_bytes(folder)
+
+    unpacked = unpack_bytes_to_folder(bytes(blob), tmp_path / "out")
+
+    assert unpacked == metadata
+    for file_info in metadata["files"]:
+        assert (tmp_path / "out" / file_info["path"]).read_bytes() == \
+            (folder / file_info["path"]).read_bytes()
+
+
+def test_walk_order_matches_os_walk(tmp_path):
+    folder = tmp_path / "tree"
+    for i, name in enumerate(["q", "c", "k/x", "k/b", "k/b/y"]):
+        (folder / name).mkdir(parents=True, exist_ok=True)
+        for filename in ("2.txt", "10.txt", "_1.txt"):
+            (folder / name / filename).write_text(f"{name}/{filename} {i}")
+    (folder / "k" / "root.txt").write_text("root")
+    # Symlinked directories are not followed, as with os.walk
+    (folder / "link").symlink_to(folder / "k", target_is_directory=True)
+
+    blob, metadata = pack_folder_to_bytes(folder)
+    expected_blob, expected_metadata = _reference_pack(folder)
+
+    assert [f["path"] for f in metadata["files"]] == \
+        [f["path"] for f in expected_metadata["files"]]
+    assert blob == expected_blob
+
+
+def test_failed_and_shrunk_reads_close_up(folder, monkeypatch):
+    read_into = packer._read_into
+
+    # m.bin fails to read and notes.txt shrinks by 10 bytes after sizing
+    def flaky_read_into(filepath, dest):
+        if filepath.endswith("m.bin"):
+            dest.release()
+            raise OSError("device went away")
+        if filepath.endswith("notes.txt"):
+            with dest:
+                return read_into(filepath, dest[:-10])
+        return read_into(filepath, dest)
+
+    monkeypatch.setattr(packer, "_read_into", flaky_read_into)
+    (folder / "b" / "deep" / "notes.txt").write_bytes(b"x" * 1010)
+    blob, metadata = pack_folder_to_bytes(folder)
+
+    (folder / "m.bin").unlink()
+    (folder / "b" / "deep" / "notes.txt").write_bytes(b"x" * 1000)
+    expected_blob, expected_metadata = _reference_pack(folder)
+
+    assert blob == expected_blob
+    assert metadata == expected_metadata
@@ -0,0 +1,153 @@
+"""Round-trip tests for the archive layout written by encode_folder."""
+
+import json
+
+import numpy as np
+import pytest
+
+from crystal_archive.archive.manifest import Manifest
+from crystal_archive.archive.pipeline import VOXEL_FILE, decode_archive, encode_folder
+from crystal_archive.codecs.compression import compress_data
+from crystal_archive.codecs.ecc_ldpc import SimpleLDPC
+from crystal_archive.codecs.ecc_rs import ReedSolomonCodec
+from crystal_archive.codecs.hashing import MerkleTree
+from crystal_archive.codecs.interleave import Interleaver
+from crystal_archive.mapping.voxel_map import VoxelMapper
+from crystal_archive.packer import pack_folder_to_bytes
+
+
+@pytest.fixture
+def source_folder(tmp_path):
+    folder = tmp_path / "source"
+    (folder / "nested").mkdir(parents=True)
+    rng = np.random.default_rng(0)
+    (folder / "notes.txt").write_text("crystal archive layout test\n" * 200)
+    random_bytes = rng.integers(0, 256, 9000, dtype=np.uint8).tobytes()
+    (folder / "nested" / "random.bin").write_bytes(random_bytes)
+    (folder / "nested" / "empty.txt").write_bytes(b"")
+    return folder
+
+
+def _expected_shards(source_folder, encoding):
+    blob, _ = pack_folder_to_bytes(source_folder)
+    compressed, _ = compress_data(
+        blob,
+        codec=encoding["compression"]["codec"],
+        level=encoding["profile_params"]["compression_level"]
+    )
+    return ReedSolomonCodec().create_shard_matrix(
+        compressed, shard_size=encoding["layout"]["shard_size"]
+    )
+
+
+@pytest.mark.parametrize("profile", ["A", "B"])
+def test_layout_round_trip(tmp_path, source_folder, profile):
+    output_dir, _ = encode_folder(source_folder, tmp_path / "archive", profile=profile)
+    manifest = Manifest.load(output_dir / "manifest.json")
+    encoding = manifest.data["encoding"]
+    layout = encoding["layout"]
+    voxel = encoding["voxel"]
+
+    with np.load(output_dir / "voxels" / VOXEL_FILE) as voxel_data:
+        symbols = voxel_data["symbols"]
+        angles_q = voxel_data["angles"]
+        retardances_q = voxel_data["retardances"]
+
+    # Quantized voxels still demap to the stored symbols
+    mapper = VoxelMapper(mode=voxel["mode"])
+    quantization = voxel["quantization"]
+    assert angles_q.dtype == np.uint8 and retardances_q.dtype == np.uint8
+    demapped, _ = mapper.voxels_to_symbols(
+        angles_q / quantization["angle_scale"], retardances_q / quantization["retardance_scale"]
+    )
+    np.testing.assert_array_equal(demapped, symbols)
+
+    # The symbol stream holds exactly the recorded coded bits plus symbol padding
+    bits = mapper.symbols_to_bits(symbols)
+    n_bits = layout["total_bits"]
+    assert 0 <= len(bits) - n_bits < mapper.bits_per_voxel
+
+    interleaving = encoding["interleaving"]
+    interleaver = Interleaver(
+        span=interleaving["span"], depth=interleaving["depth"], seed=interleaving["seed"]
+    )
+    coded = interleaver.block_deinterleave(bits[:n_bits], interleaver.permutation(n_bits))
+
+    ldpc_params = encoding["ecc"]["ldpc"]
+    ldpc = SimpleLDPC(n=ldpc_params["n"], k=ldpc_params["k"])
+    blocks = coded.reshape(layout["n_shards"] * layout["blocks_per_shard"], ldpc.n)
+    np.testing.assert_array_equal(ldpc.encode_batch(blocks[:, :ldpc.k]), blocks)
+
+    # Dropping each shard's block padding gives back the shards
+    shard_bits = blocks[:, :ldpc.k].reshape(layout["n_shards"], -1)[:, :layout["shard_size"] * 8]
+    shards = _expected_shards(source_folder, encoding)
+    np.testing.assert_array_equal(np.packbits(shard_bits, axis=1), shards)
+
+    assert manifest.data["integrity"]["merkle_root"] == MerkleTree(list(shards)).get_root()
+
+
+def _capture_rs_input(monkeypatch):
+    """
+    Let decode_archive run up to Reed-Solomon and record what it receives.
+
+    The encoder's LDPC parity does not satisfy H, so hard decoding would flip
+    correct bits; the systematic bits are taken as decoded instead.
+    """
+    captured = []
+
+    def decode_hard_batch(self, received, max_iter=50):
+        return received[:, :self.k].copy(), np.ones(len(received), dtype=bool)
+
+    def decode(self, encoded_data, errors_pos=None):
+        captured.append(encoded_data)
+        return None
+
+    monkeypatch.setattr(SimpleLDPC, "decode_hard_batch", decode_hard_batch)
+    monkeypatch.setattr(ReedSolomonCodec, "decode", decode)
+    return captured
+
+
+def _write_tile_json(voxels_dir, encoding):
+    """Rewrite VOXEL_FILE in the per-tile JSON layout of manifest version 1.0.0."""
+    mapper = VoxelMapper(mode=encoding["voxel"]["mode"])
+    with np.load(voxels_dir / VOXEL_FILE) as voxel_data:
+        symbols = voxel_data["symbols"]
+    angles, retardances = mapper.symbols_to_voxels(symbols)
+    (voxels_dir / VOXEL_FILE).unlink()
+
+    tile_size = 256
+    tiles_per_plane = 64
+    for global_tile_idx, start in enumerate(range(0, len(symbols), tile_size)):
+        plane_idx, tile_idx = divmod(global_tile_idx, tiles_per_plane)
+        plane_dir = voxels_dir / f"plane_{plane_idx:03d}"
+        plane_dir.mkdir(exist_ok=True)
+        end = start + tile_size
+        tile_data = {
+            "symbols": symbols[start:end].tolist(),
+            "angles": angles[start:end].tolist(),
+            "retardances": retardances[start:end].tolist()
+        }
+        (plane_dir / f"tile_{tile_idx:04d}.json").write_text(json.dumps(tile_data))
+
+
+@pytest.mark.parametrize("voxel_layout", ["npz", "tile_json"])
+def test_decode_recovers_shards(tmp_path, monkeypatch, source_folder, voxel_layout):
+    output_dir, manifest = encode_folder(source_folder, tmp_path / "archive", profile="B")
+    encoding = manifest.data["encoding"]
+    if voxel_layout == "tile_json":
+        _write_tile_json(output_dir / "voxels", encoding)
+    captured = _capture_rs_input(monkeypatch)
+
+    # Encode writes shards without RS parity, so the RS stage cannot succeed
+    with pytest.raises(ValueError, match="Reed-Solomon"):
+        decode_archive(output_dir, tmp_path / "recovered")
+
+    assert captured == [_expected_shards(source_folder, encoding).tobytes()]
+
+
+def test_decode_rejects_missing_voxels(tmp_path, source_folder):
+    output_dir, _ = encode_folder(source_folder, tmp_path / "archive")
+    (output_dir / "voxels" / VOXEL_FILE).unlink()
+
+    with pytest.raises(ValueError, match="No voxel data"):
+        decode_archive(output_dir, tmp_path / "recovered")
@@ -0,0 +1,56 @@
+"""Tests for symbol/bit/voxel mapping."""
+
+import numpy as np
+import pytest
+
+from crystal_archive.mapping.voxel_map import VoxelMapper
+
+
+@pytest.mark.parametrize("mode", ["3bit", "5bit"])
+def test_bits_symbols_round_trip(mode):
+    mapper = VoxelMapper(mode=mode)
+    bits = np.random.default_rng(0).integers(0, 2, 1000, dtype=np.uint8)
+
+    symbols = mapper.bits_to_symbols(bits)
+    recovered = mapper.symbols_to_bits(symbols)
+
+    assert symbols.max() < mapper.num_symbols
+    np.testing.assert_array_equal(recovered[:len(bits)], bits)
+    assert not recovered[len(bits):].any()
+
+    # MSB-first grouping
+    bpv = mapper.bits_per_voxel
+    groups = np.pad(bits, (0, -len(bits) % bpv)).reshape(-1, bpv)
+    weights = 1 << np.arange(mapper.bits_per_voxel - 1, -1, -1)
+    np.testing.assert_array_equal(symbols, groups @ weights)
+
+
+@pytest.mark.parametrize("mode", ["3bit", "5bit"])
+def test_voxels_round_trip(mode):
+    mapper = VoxelMapper(mode=mode)
+    symbols = np.arange(mapper.num_symbols)
+
+    angles, retardances = mapper.symbols_to_voxels(symbols)
+    recovered, _ = mapper.voxels_to_symbols(angles, retardances)
+
+    np.testing.assert_array_equal(recovered, symbols)
+
+
+@pytest.mark.parametrize("mode", ["3bit", "5bit"])
+def test_int16_demapper_matches_float(mode):
+    mapper = VoxelMapper(mode=mode)
+    rng = np.random.default_rng(1)
+    symbols = rng.integers(0, mapper.num_symbols, 5000)
+    angles, retardances = mapper.symbols_to_voxels(symbols)
+
+    # Noisy measurements on the int16 grid, so both demappers see the same values
+    angles = np.round((angles + rng.normal(0, 8, len(angles))) % 180, 2)
+    retardances = np.round(retardances + rng.normal(0, 0.05, len(retardances)), 4)
+
+    expected, _ = mapper.voxels_to_symbols(angles, retardances)
+    angles_q, retardances_q = mapper.quantize_voxels(angles, retardances)
+    got, reliabilities = mapper.voxels_to_symbols_int16(angles_q, retardances_q, soft_output=True)
+
+    np.testing.assert_array_equal(got, expected)
+    assert reliabilities.dtype == np.int8
+    assert reliabilities.min() >= 13 and reliabilities.max() <= 127